@@ -10,38 +10,228 @@ Usage:
 
 Requirements:
     - Python 3.7+
-    - requests, tqdm (pip install requests tqdm)
+    - httpx (pip install "httpx[http2]")
+    - tqdm (optional, for --tqdm progress bars)
     - nebula CLI installed
 """
 
 import argparse
+import http.client
 import json
 import os
-import re
+import random
 import shutil
+import signal
+import socket
+import statistics
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
 
 try:
-    import requests
-    from tqdm import tqdm
+    import httpx
 except ImportError:
-    print("❌ Missing required packages. Install with: pip install requests tqdm")
+    print("❌ Missing required packages. Install with: pip install \"httpx[http2]\"")
     sys.exit(1)
 
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The CLI's command functions, called in-process so each operation doesn't pay
+# interpreter start-up and imports for a fresh `nebula` subprocess
+CLI_ROOT = Path(__file__).resolve().parent / "client" / "cli"
+if CLI_ROOT.is_dir():
+    sys.path.insert(0, str(CLI_ROOT))
+try:
+    from src.commands.upload import upload_file
+    from src.commands.download import download_file
+    CLI_IN_PROCESS = True
+except ImportError:
+    CLI_IN_PROCESS = False
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Transcode status polling: exponential backoff between these bounds (seconds)
+POLL_INTERVAL_MIN = 0.2
+POLL_INTERVAL_MAX = 5.0
+POLL_BACKOFF = 1.5
+POLL_JITTER = 0.1
+
+# Lines of CLI output kept when running commands as subprocesses (stdout + stderr)
+RUN_OUTPUT_TAIL_LINES = 400
+
+# Stream benchmark read size, and bytes accumulated between progress updates
+STREAM_CHUNK_BYTES = 256 * 1024
+PROGRESS_UPDATE_BYTES = 4 * STREAM_CHUNK_BYTES
+
+# Buffer for copies that have to go through user space
+COPY_BUFFER_BYTES = 1024 * 1024
+
+
+def elapsed_seconds(start_ns: int) -> float:
+    """Seconds since a time.perf_counter_ns() reading (integer clock, no float drift)"""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
+
+def throughput_mbps(size_mb: float, duration_seconds: float) -> float:
+    """Megabits per second for size_mb transferred in duration_seconds"""
+    return (size_mb * 8) / duration_seconds if duration_seconds > 0 else 0
+
+
+def summarize_throughput(measurements: list) -> Optional[Dict[str, float]]:
+    """Median and p95 throughput across successful transfer measurements"""
+    values = [m['throughput_mbps'] for m in measurements
+              if m['success'] and m.get('throughput_mbps', 0) > 0]
+    if len(values) < 2:
+        return None
+    return {
+        'count': len(values),
+        'median_mbps': statistics.median(values),
+        'p95_mbps': statistics.quantiles(values, n=20, method='inclusive')[-1]
+    }
+
+
+def copy_file_fast(src: str, dst: str):
+    """Copy file contents (no metadata), keeping the data in the kernel where possible"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(in_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        size = os.fstat(in_fd).st_size
+        offset = 0
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while offset < size:
+                    copied = os.copy_file_range(in_fd, out_fd, size - offset, offset, offset)
+                    if copied == 0:
+                        break
+                    offset += copied
+            except OSError:
+                pass  # e.g. EXDEV/ENOSYS on filesystems that can't do it; finish below
+
+        if offset < size:
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            # shutil.copyfile's own fast path: sendfile(2) file-to-file on Linux
+            if sys.platform.startswith('linux'):
+                while offset < size:
+                    sent = os.sendfile(out_fd, in_fd, None, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFFER_BYTES)
+
+
+def job_duration_seconds(job: Dict[str, Any]) -> Optional[float]:
+    """Server-side run time of a finished transcode job, from its ISO timestamps"""
+    started_at, completed_at = job.get('started_at'), job.get('completed_at')
+    if not started_at or not completed_at:
+        return None
+    started = datetime.fromisoformat(started_at.replace('Z', '+00:00'))
+    completed = datetime.fromisoformat(completed_at.replace('Z', '+00:00'))
+    return (completed - started).total_seconds()
+
+
+class FastProgress:
+    """Minimal progress reporter: counts bytes and prints at most once per interval.
+
+    Unlike tqdm there is no lock or formatting work per update, so it stays
+    out of the way of the transfer being measured.
+    """
+
+    def __init__(self, total: int, desc: str = "Progress", interval: float = 1.0):
+        self.total = total
+        self.desc = desc
+        self.interval = interval
+        self.n = 0
+        self.t0 = self.last = time.perf_counter()
+
+    def update(self, k: int):
+        self.n += k
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self._print(now)
+
+    def close(self):
+        self._print(time.perf_counter())
+        print()
+
+    def _print(self, now: float):
+        elapsed = now - self.t0
+        rate = self.n / elapsed / (1024 * 1024) if elapsed > 0 else 0
+        done = f"{self.n / (1024 * 1024):.1f}"
+        if self.total:
+            done += f"/{self.total / (1024 * 1024):.1f} MB ({self.n * 100 / self.total:.0f}%)"
+        else:
+            done += " MB"
+        print(f"   {self.desc}: {done} @ {rate:.1f} MB/s", end='\r', flush=True)
+
 
 class NebulaBenchmark:
     """Orchestrates Nebula CLI commands and measures performance"""
 
-    def __init__(self, server_url: str, verbose: bool = False):
+    def __init__(self, server_url: str, verbose: bool = False, progress: bool = True,
+                 zero_copy_upload: bool = False, use_tqdm: bool = False,
+                 use_subprocess: bool = False):
         self.server_url = server_url.rstrip('/')
         self.verbose = verbose
-        self.session = requests.Session()
+        self.use_subprocess = use_subprocess or not CLI_IN_PROCESS
+        self.progress = progress
+        self.use_tqdm = use_tqdm and tqdm is not None
+        self.zero_copy_upload = zero_copy_upload
+        # Flipped off the first time the server can't answer a batched job poll
+        self._batch_supported = True
+        # Likewise for the server-sent transcode events stream
+        self._events_supported = True
+        # One pooled client for every HTTP call in the benchmark. HTTP/2 lets the
+        # status polls multiplex over the same connection when the server offers it.
+        # Disable Nagle for the small poll requests and keep idle sockets alive
+        # between phases so nothing pays for a fresh handshake.
+        transport = httpx.HTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=8),
+            socket_options=[
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ],
+        )
+        self.session = httpx.Client(transport=transport, timeout=httpx.Timeout(60.0))
+
+    def warm_up(self):
+        """Resolve the server and open a pooled connection before anything is timed.
+
+        Keeps DNS lookup and TCP/TLS setup out of the first measurement. Uses the
+        lightweight /api/ping rather than /health, which gathers system stats.
+        """
+        url = urlsplit(self.server_url)
+        try:
+            socket.getaddrinfo(url.hostname, url.port or (443 if url.scheme == 'https' else 80),
+                               type=socket.SOCK_STREAM)
+            self.session.get(f"{self.server_url}/api/ping", timeout=5)
+        except Exception as e:
+            self.log(f"Warm-up failed (continuing): {e}")
 
     def log(self, message: str):
         if self.verbose:
@@ -49,11 +239,10 @@ class NebulaBenchmark:
 
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Get local file metadata"""
-        path = Path(file_path)
-        size_bytes = path.stat().st_size
+        size_bytes = os.stat(file_path).st_size
         return {
-            'path': str(path.absolute()),
-            'filename': path.name,
+            'path': os.path.abspath(file_path),
+            'filename': os.path.basename(file_path),
             'size_bytes': size_bytes,
             'size_mb': size_bytes / (1024 * 1024)
         }
@@ -66,12 +255,12 @@ class NebulaBenchmark:
         if file_path.startswith('/mnt/'):
             self.log("WSL optimization: Copying file to Linux filesystem...")
             temp_dir = tempfile.gettempdir()
-            temp_path = os.path.join(temp_dir, f"nebula_bench_{os.getpid()}_{Path(file_path).name}")
+            temp_path = os.path.join(temp_dir, f"nebula_bench_{os.getpid()}_{os.path.basename(file_path)}")
             
             print(f"📋 Copying file from Windows to Linux temp (faster I/O)...")
-            start = time.time()
-            shutil.copy2(file_path, temp_path)
-            copy_time = time.time() - start
+            start_ns = time.perf_counter_ns()
+            copy_file_fast(file_path, temp_path)
+            copy_time = elapsed_seconds(start_ns)
             print(f"   Copied in {copy_time:.1f}s")
             
             return temp_path, temp_path
@@ -81,55 +270,178 @@ class NebulaBenchmark:
         """Run a CLI command and measure its execution time"""
         self.log(f"Running: {' '.join(cmd)}")
         
-        start_time = time.time()
+        # Only the tail of the output is kept (as raw bytes): it's all the callers
+        # parse, and progress bars can make the full output large
+        tail = deque(maxlen=RUN_OUTPUT_TAIL_LINES)
+
+        def _collect(stream):
+            for line in stream:
+                tail.append(line)
+                if self.verbose:
+                    sys.stdout.write(f"   | {line.decode(errors='replace')}")
+
+        start_ns = time.perf_counter_ns()
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            duration = time.time() - start_time
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=64 * 1024)
+            reader = threading.Thread(target=_collect, args=(proc.stdout,), daemon=True)
+            reader.start()
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                return {
+                    'success': False,
+                    'duration_seconds': elapsed_seconds(start_ns),
+                    'error': f'Timeout after {timeout}s'
+                }
+            duration = elapsed_seconds(start_ns)
+            reader.join()
             
             return {
-                'success': result.returncode == 0,
+                'success': returncode == 0,
                 'duration_seconds': duration,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'returncode': result.returncode
+                'stdout': b''.join(tail).decode(errors='replace'),
+                'returncode': returncode
             }
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
+        except Exception as e:
+            duration = elapsed_seconds(start_ns)
             return {
                 'success': False,
                 'duration_seconds': duration,
-                'error': f'Timeout after {timeout}s'
+                'error': str(e)
             }
-        except Exception as e:
-            duration = time.time() - start_time
+
+    def run_callable(self, fn, *args, **kwargs) -> Dict[str, Any]:
+        """Call a CLI command function in-process and measure its execution time"""
+        self.log(f"Calling: {fn.__name__}{args}")
+
+        # Commands turn Ctrl-C into typer.Exit, which would read as a failed
+        # measurement; note the interrupt so it still stops the benchmark
+        interrupted = False
+
+        def on_sigint(signum, frame):
+            nonlocal interrupted
+            interrupted = True
+            signal.default_int_handler(signum, frame)
+
+        # Signal handlers can only be installed from the main thread
+        watch_sigint = threading.current_thread() is threading.main_thread()
+        if watch_sigint:
+            previous_handler = signal.signal(signal.SIGINT, on_sigint)
+        start_ns = time.perf_counter_ns()
+        try:
+            value = fn(*args, **kwargs)
+            return {
+                'success': True,
+                'duration_seconds': elapsed_seconds(start_ns),
+                'value': value
+            }
+        except (Exception, SystemExit) as e:
+            # CLI commands signal failure with typer.Exit after printing the reason
+            exit_code = getattr(e, 'exit_code', getattr(e, 'code', None))
             return {
                 'success': False,
+                'duration_seconds': elapsed_seconds(start_ns),
+                'error': f'{fn.__name__} exited with code {exit_code}' if exit_code is not None else str(e)
+            }
+        finally:
+            if watch_sigint:
+                signal.signal(signal.SIGINT, previous_handler)
+            if interrupted:
+                raise KeyboardInterrupt
+
+    def upload_sendfile(self, file_path: str, size_bytes: int) -> Dict[str, Any]:
+        """Upload with a hand-written multipart POST whose file part goes out via sendfile(2).
+
+        The file bytes go from the page cache straight to the socket, so the
+        client never copies them through Python buffers. Plain HTTP only.
+        """
+        url = urlsplit(self.server_url)
+        if url.scheme != 'http':
+            return {'success': False, 'duration_seconds': 0.0,
+                    'error': 'Zero-copy upload requires an http:// server URL'}
+
+        boundary = f"nebula-{random.getrandbits(64):016x}"
+        filename = os.path.basename(file_path).replace('"', '_')
+        head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="description"\r\n\r\n'
+            f'Benchmark test file\r\n'
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'
+        ).encode()
+        tail = f'\r\n--{boundary}--\r\n'.encode()
+        request_head = (
+            f'POST {url.path}/api/upload HTTP/1.1\r\n'
+            f'Host: {url.netloc}\r\n'
+            f'Content-Type: multipart/form-data; boundary={boundary}\r\n'
+            f'Content-Length: {len(head) + size_bytes + len(tail)}\r\n'
+            f'Connection: close\r\n\r\n'
+        ).encode()
+
+        self.log(f"Zero-copy upload to {url.netloc}")
+        start_ns = time.perf_counter_ns()
+        try:
+            with socket.create_connection((url.hostname, url.port or 80), timeout=1800) as sock, \
+                    open(file_path, 'rb') as f:
+                sock.sendall(request_head + head)
+                # socket.sendfile loops over os.sendfile until every byte is sent
+                sock.sendfile(f, 0, size_bytes)
+                sock.sendall(tail)
+
+                response = http.client.HTTPResponse(sock)
+                response.begin()
+                body = response.read()
+            duration = elapsed_seconds(start_ns)
+
+            if response.status != 200:
+                return {'success': False, 'duration_seconds': duration,
+                        'error': f'HTTP {response.status}: {body[:200]!r}'}
+            return {
+                'success': True,
                 'duration_seconds': duration,
+                'file_id': json.loads(body)['file']['id']
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'duration_seconds': elapsed_seconds(start_ns),
                 'error': str(e)
             }
 
-    def benchmark_upload(self, file_path: str) -> Dict[str, Any]:
-        """Benchmark upload using nebula CLI"""
-        file_info = self.get_file_info(file_path)
+    def benchmark_upload(self, file_path: str, file_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Benchmark upload using nebula CLI
+
+        Args:
+            file_path: Path to the file to upload
+            file_info: Metadata from get_file_info, reused to avoid another stat()
+        """
+        file_info = file_info or self.get_file_info(file_path)
         print(f"\n📤 UPLOAD BENCHMARK")
         print(f"   File: {file_info['filename']} ({file_info['size_mb']:.1f} MB)")
         
-        cmd = ['nebula', 'upload', file_path, '--description', 'Benchmark test file']
-        result = self.run_command(cmd, "Upload", timeout=1800)  # 30 min timeout
+        if self.zero_copy_upload:
+            result = self.upload_sendfile(file_path, file_info['size_bytes'])
+        elif not self.use_subprocess:
+            result = self.run_callable(upload_file, file_path, server_url=self.server_url,
+                                       description='Benchmark test file')
+            if result['success']:
+                result['file_id'] = result['value']['id']
+        else:
+            cmd = ['nebula', 'upload', file_path, '--description', 'Benchmark test file', '--json']
+            result = self.run_command(cmd, "Upload", timeout=1800)  # 30 min timeout
         
-        # Parse file ID from output
-        file_id = None
-        if result['success'] and result.get('stdout'):
-            match = re.search(r'File ID:\s*(\d+)', result['stdout'])
-            if match:
-                file_id = int(match.group(1))
+        # The CLI's --json flag ends its output with the file metadata as one JSON line
+        file_id = result.get('file_id')
+        if file_id is None and result['success'] and result.get('stdout'):
+            json_line = next((line for line in reversed(result['stdout'].splitlines())
+                              if line.startswith('{')), None)
+            if json_line:
+                file_id = json.loads(json_line)['id']
         
-        throughput = (file_info['size_mb'] * 8) / result['duration_seconds'] if result['duration_seconds'] > 0 else 0
+        throughput = throughput_mbps(file_info['size_mb'], result['duration_seconds']) if result['success'] else 0
         
         return {
             'operation': 'upload',
@@ -150,14 +462,17 @@ class NebulaBenchmark:
         temp_dir = tempfile.gettempdir()
         output_path = os.path.join(temp_dir, f"nebula_bench_download_{file_id}.tmp")
         
-        cmd = ['nebula', 'download', str(file_id), '-o', output_path]
-        result = self.run_command(cmd, "Download", timeout=1800)
+        if self.use_subprocess:
+            cmd = ['nebula', 'download', str(file_id), '-o', output_path]
+            result = self.run_command(cmd, "Download", timeout=1800)
+        else:
+            result = self.run_callable(download_file, file_id, output_path, server_url=self.server_url)
         
         # Clean up downloaded file
         if os.path.exists(output_path):
             os.remove(output_path)
         
-        throughput = (file_size_mb * 8) / result['duration_seconds'] if result['duration_seconds'] > 0 else 0
+        throughput = throughput_mbps(file_size_mb, result['duration_seconds']) if result['success'] else 0
         
         return {
             'operation': 'download',
@@ -168,11 +483,59 @@ class NebulaBenchmark:
             'error': result.get('error')
         }
 
-    def benchmark_stream(self, file_id: int, file_size_mb: float, range_bytes: Optional[int] = None) -> Dict[str, Any]:
-        """Benchmark streaming by fetching data via HTTP (no player)"""
+    def benchmark_download_null(self, file_id: int, file_size_mb: float) -> Dict[str, Any]:
+        """Benchmark download network throughput alone: fetch in-process and discard the bytes"""
+        print(f"\n📥 DOWNLOAD BENCHMARK (to null)")
+        print(f"   File ID: {file_id}")
+
+        start_ns = time.perf_counter_ns()
+        try:
+            # Same data path as the CLI: presigned MinIO URL when offered, API proxy otherwise
+            url = f"{self.server_url}/api/files/{file_id}/download"
+            presign = self.session.get(f"{self.server_url}/api/files/{file_id}/download-url", timeout=10)
+            if presign.status_code == 200 and presign.json().get('url'):
+                url = presign.json()['url']
+
+            with self.session.stream("GET", url, timeout=1800) as response:
+                response.raise_for_status()
+                for _ in response.iter_bytes(chunk_size=STREAM_CHUNK_BYTES):
+                    pass
+                downloaded = response.num_bytes_downloaded
+        except Exception as e:
+            return {
+                'operation': 'download_null',
+                'success': False,
+                'error': str(e),
+                'duration_seconds': elapsed_seconds(start_ns),
+                'throughput_mbps': 0
+            }
+
+        duration = elapsed_seconds(start_ns)
+        actual_mb = downloaded / (1024 * 1024)
+        return {
+            'operation': 'download_null',
+            'success': True,
+            'size_mb': actual_mb,
+            'duration_seconds': duration,
+            'throughput_mbps': throughput_mbps(actual_mb, duration)
+        }
+
+    def benchmark_stream(self, file_id: int, file_size_mb: float, range_bytes: Optional[int] = None,
+                         progress: Optional[bool] = None) -> Dict[str, Any]:
+        """Benchmark streaming by fetching data via HTTP (no player)
+
+        Args:
+            file_id: ID of the uploaded file
+            file_size_mb: Size of the file, used when no range is requested
+            range_bytes: Fetch only the first range_bytes bytes
+            progress: Override the instance progress setting (off for concurrent runs)
+        """
+        if progress is None:
+            progress = self.progress
         if range_bytes:
             print(f"\n🎬 STREAM BENCHMARK (Range: {range_bytes/(1024*1024):.1f} MB)")
-            headers = {'Range': f'bytes=0-{range_bytes}'}
+            # Range end is inclusive, so this requests exactly range_bytes bytes
+            headers = {'Range': f'bytes=0-{range_bytes - 1}'}
             expected_mb = range_bytes / (1024 * 1024)
             op_name = 'stream_range'
         else:
@@ -180,29 +543,55 @@ class NebulaBenchmark:
             headers = {}
             expected_mb = file_size_mb
             op_name = 'stream_full'
+        # Measure wire bytes: no compression on the server, no decoding here
+        headers['Accept-Encoding'] = 'identity'
         
         url = f"{self.server_url}/api/files/{file_id}/stream"
         
         try:
-            start_time = time.time()
-            
-            response = self.session.get(url, headers=headers, stream=True, timeout=1800)
-            if response.status_code not in [200, 206]:
-                raise Exception(f"HTTP {response.status_code}")
-            
-            # Stream and discard data (measuring throughput)
-            downloaded = 0
-            content_length = int(response.headers.get('Content-Length', 0))
-            
-            with tqdm(total=content_length, unit='B', unit_scale=True, desc="Streaming") as pbar:
-                for chunk in response.iter_content(chunk_size=65536):  # 64KB chunks
-                    if chunk:
-                        downloaded += len(chunk)
-                        pbar.update(len(chunk))
+            start_ns = time.perf_counter_ns()
             
-            duration = time.time() - start_time
+            with self.session.stream("GET", url, headers=headers, timeout=1800) as response:
+                if response.status_code not in [200, 206]:
+                    raise Exception(f"HTTP {response.status_code}")
+                if range_bytes and response.status_code != 206:
+                    # A 200 means the server ignored Range and is sending the whole file
+                    raise Exception(f"Range not honoured (HTTP {response.status_code})")
+
+                # Stream and discard data (measuring throughput)
+                downloaded = 0
+                content_length = int(response.headers.get('Content-Length', 0))
+                if range_bytes:
+                    self.log(f"Content-Range: {response.headers.get('Content-Range', 'n/a')}")
+
+                if progress:
+                    if self.use_tqdm:
+                        pbar = tqdm(total=content_length, unit='B', unit_scale=True, desc="Streaming")
+                    else:
+                        pbar = FastProgress(content_length, desc="Streaming")
+                    # Locals skip attribute and global lookups in the hot loop
+                    update = pbar.update
+                    step = PROGRESS_UPDATE_BYTES
+                    chunks = response.iter_raw(chunk_size=STREAM_CHUNK_BYTES)
+                    try:
+                        reported = 0
+                        for chunk in chunks:
+                            downloaded += len(chunk)
+                            if downloaded - reported >= step:
+                                update(downloaded - reported)
+                                reported = downloaded
+                        update(downloaded - reported)
+                    finally:
+                        pbar.close()
+                else:
+                    # Fast path: drain the body without per-chunk bookkeeping
+                    for _ in response.iter_raw(chunk_size=STREAM_CHUNK_BYTES):
+                        pass
+                    downloaded = response.num_bytes_downloaded
+
+            duration = elapsed_seconds(start_ns)
             actual_mb = downloaded / (1024 * 1024)
-            throughput = (actual_mb * 8) / duration if duration > 0 else 0
+            throughput = throughput_mbps(actual_mb, duration)
             
             return {
                 'operation': op_name,
@@ -222,6 +611,94 @@ class NebulaBenchmark:
                 'throughput_mbps': 0
             }
 
+    def benchmark_parallel_streams(self, file_id: int, streams: int) -> Dict[str, Any]:
+        """Benchmark aggregate throughput of several concurrent full-file streams"""
+        print(f"\n🎬 PARALLEL STREAM BENCHMARK ({streams} streams)")
+        url = f"{self.server_url}/api/files/{file_id}/stream"
+
+        def _drain() -> int:
+            # httpx.Client is thread-safe, so every worker shares the pooled session
+            with self.session.stream("GET", url, timeout=1800) as response:
+                response.raise_for_status()
+                for _ in response.iter_bytes(chunk_size=STREAM_CHUNK_BYTES):
+                    pass
+                return response.num_bytes_downloaded
+
+        start_ns = time.perf_counter_ns()
+        try:
+            with ThreadPoolExecutor(max_workers=streams) as pool:
+                futures = [pool.submit(_drain) for _ in range(streams)]
+                total_bytes = sum(future.result() for future in as_completed(futures))
+        except Exception as e:
+            return {
+                'operation': 'stream_parallel',
+                'success': False,
+                'error': str(e),
+                'duration_seconds': elapsed_seconds(start_ns),
+                'throughput_mbps': 0
+            }
+
+        duration = elapsed_seconds(start_ns)
+        total_mb = total_bytes / (1024 * 1024)
+        return {
+            'operation': 'stream_parallel',
+            'success': True,
+            'streams': streams,
+            'size_mb': total_mb,
+            'duration_seconds': duration,
+            'throughput_mbps': throughput_mbps(total_mb, duration)
+        }
+
+    def _poll_batch(self, job_ids: list) -> Optional[list]:
+        """Fetch the status of several transcode jobs in a single request.
+
+        Returns None when the server can't serve the batch, after which callers
+        fall back to the per-file status endpoint.
+        """
+        response = self.session.get(
+            f"{self.server_url}/api/transcode/jobs/all",
+            params={'ids': ','.join(map(str, job_ids))},
+            timeout=10
+        )
+        if response.status_code in (400, 404, 405, 422):
+            self._batch_supported = False
+            return None
+        response.raise_for_status()
+
+        wanted = set(job_ids)
+        jobs = [job for job in response.json().get('jobs', []) if job['job_id'] in wanted]
+        # Older servers ignore the ids filter; don't trust a partial answer
+        if len(jobs) != len(wanted):
+            self._batch_supported = False
+            return None
+        return jobs
+
+    def _watch_transcode_events(self, file_id: int, observe, deadline_ns: int) -> Optional[Dict[str, Any]]:
+        """Follow the server-sent transcode events for a file, feeding each job snapshot to observe.
+
+        Returns observe's final result, or None if the stream is unavailable or ends
+        early, in which case callers fall back to polling.
+        """
+        url = f"{self.server_url}/api/transcode/{file_id}/events"
+        try:
+            # The server sends a keepalive comment while nothing changes, so a read
+            # timeout only fires if the connection has actually gone quiet
+            with self.session.stream("GET", url, headers={'Accept': 'text/event-stream'},
+                                     timeout=httpx.Timeout(60.0)) as response:
+                if response.status_code != 200:
+                    self._events_supported = False
+                    return None
+                for line in response.iter_lines():
+                    if line.startswith('data:'):
+                        result = observe(json.loads(line[5:])['jobs'])
+                        if result is not None:
+                            return result
+                    if time.perf_counter_ns() > deadline_ns:
+                        break
+        except Exception as e:
+            self.log(f"Transcode event stream failed, polling instead: {e}")
+        return None
+
     def benchmark_transcode(self, file_id: int, qualities: list = None) -> Dict[str, Any]:
         """Benchmark transcoding - trigger and wait for completion"""
         if qualities is None:
@@ -230,67 +707,128 @@ class NebulaBenchmark:
         print(f"\n🎥 TRANSCODE BENCHMARK")
         print(f"   File ID: {file_id}, Qualities: {qualities}")
         
-        # Trigger transcoding via CLI
-        quality_str = ','.join(map(str, qualities))
-        cmd = ['nebula', 'transcode', str(file_id), '-q', quality_str]
-        trigger_result = self.run_command(cmd, "Transcode trigger", timeout=30)
-        
-        if not trigger_result['success']:
+        # Trigger transcoding through the API so the created job IDs come back
+        trigger_ns = time.perf_counter_ns()
+        try:
+            response = self.session.post(
+                f"{self.server_url}/api/transcode",
+                json={'file_id': file_id, 'qualities': qualities},
+                timeout=30
+            )
+            response.raise_for_status()
+            job_ids = [job['job_id'] for job in response.json().get('jobs', [])]
+        except Exception as e:
             return {
                 'operation': 'transcode',
                 'success': False,
-                'error': trigger_result.get('error', 'Failed to trigger transcoding'),
-                'duration_seconds': trigger_result['duration_seconds']
+                'error': f"Failed to trigger transcoding: {e}",
+                'duration_seconds': elapsed_seconds(trigger_ns)
             }
         
         # Poll for completion
         print("   Waiting for transcoding to complete...")
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         timeout = 3600  # 1 hour max
-        
-        while time.time() - start_time < timeout:
+
+        # Poll quickly at first so short jobs are noticed promptly, then back off
+        # so long transcodes don't generate a steady stream of status requests.
+        interval = POLL_INTERVAL_MIN
+        finished_count = 0
+        # Parsed once per job when it is first seen completed, not on every poll
+        job_durations = {}
+        # The per-file status endpoint answers 304 while nothing has changed
+        etag = None
+
+        def _observe(jobs: list) -> Optional[Dict[str, Any]]:
+            """Record a snapshot of the jobs; returns the final result once none are pending"""
+            nonlocal finished_count, interval
+
+            # Check if all jobs are done (one pass over the job list)
+            counts = Counter(j['status'] for j in jobs)
+            pending = counts['pending'] + counts['processing']
+            completed = counts['completed']
+            failed = counts['failed']
+
+            # A job just finished; others are likely close behind
+            if completed + failed != finished_count:
+                finished_count = completed + failed
+                interval = POLL_INTERVAL_MIN
+
+            for job in jobs:
+                job_id = job.get('job_id', job.get('id'))
+                if job['status'] == 'completed' and job_id not in job_durations:
+                    job_durations[job_id] = job_duration_seconds(job)
+
+            if not pending:
+                duration = elapsed_seconds(start_ns)
+                timed = [d for d in job_durations.values() if d is not None]
+                return {
+                    'operation': 'transcode',
+                    'success': failed == 0,
+                    'duration_seconds': duration,
+                    'completed_jobs': completed,
+                    'failed_jobs': failed,
+                    'avg_job_seconds': sum(timed) / len(timed) if timed else None,
+                    'qualities': qualities
+                }
+            
+            # Show progress
+            for job in jobs:
+                if job['status'] == 'processing':
+                    print(f"   {job['target_quality']}p: {job.get('progress', 0):.0f}%", end='\r')
+            return None
+
+        # One pushed stream of status changes beats polling when the server has it
+        if self._events_supported:
+            result = self._watch_transcode_events(file_id, _observe, start_ns + timeout * 1_000_000_000)
+            if result is not None:
+                return result
+
+        while elapsed_seconds(start_ns) < timeout:
             try:
-                response = self.session.get(f"{self.server_url}/api/transcode/{file_id}", timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    jobs = data.get('jobs', [])
-                    
-                    # Check if all jobs are done
-                    pending = [j for j in jobs if j['status'] in ['pending', 'processing']]
-                    completed = [j for j in jobs if j['status'] == 'completed']
-                    failed = [j for j in jobs if j['status'] == 'failed']
-                    
-                    if not pending:
-                        duration = time.time() - start_time
-                        return {
-                            'operation': 'transcode',
-                            'success': len(failed) == 0,
-                            'duration_seconds': duration,
-                            'completed_jobs': len(completed),
-                            'failed_jobs': len(failed),
-                            'qualities': qualities
-                        }
-                    
-                    # Show progress
-                    for job in jobs:
-                        if job['status'] == 'processing':
-                            print(f"   {job['target_quality']}p: {job.get('progress', 0):.0f}%", end='\r')
-                
-                time.sleep(5)
-                
+                jobs = self._poll_batch(job_ids) if job_ids and self._batch_supported else None
+                if jobs is None:
+                    headers = {'If-None-Match': etag} if etag else None
+                    response = self.session.get(f"{self.server_url}/api/transcode/{file_id}",
+                                                headers=headers, timeout=10)
+                    if response.status_code == 200:
+                        etag = response.headers.get('ETag')
+                        jobs = response.json().get('jobs', [])
+
+                if jobs is not None:
+                    result = _observe(jobs)
+                    if result is not None:
+                        return result
+
             except Exception as e:
                 self.log(f"Error polling transcode status: {e}")
-                time.sleep(5)
+
+            time.sleep(interval + random.uniform(0, POLL_JITTER))
+            interval = min(interval * POLL_BACKOFF, POLL_INTERVAL_MAX)
         
         return {
             'operation': 'transcode',
             'success': False,
             'error': 'Timeout waiting for transcoding',
-            'duration_seconds': time.time() - start_time
+            'duration_seconds': elapsed_seconds(start_ns)
         }
 
-    def run_full_benchmark(self, file_path: str, skip_transcode: bool = False) -> Dict[str, Any]:
-        """Run complete benchmark suite"""
+    def run_full_benchmark(self, file_path: str, skip_transcode: bool = False,
+                           parallel_phases: bool = False, parallel_streams: int = 1,
+                           download_to_null: bool = False) -> Dict[str, Any]:
+        """Run complete benchmark suite
+
+        Args:
+            file_path: Path to the file to benchmark
+            skip_transcode: Skip the transcoding phase
+            parallel_phases: Overlap the range stream and transcode phases with the
+                full stream. Shortens wall-clock time, but per-phase numbers are no
+                longer isolated.
+            parallel_streams: When above 1, also measure aggregate throughput of
+                this many concurrent full-file streams
+            download_to_null: Also measure the download with the bytes discarded,
+                to separate network throughput from local disk writes
+        """
         results = {
             'timestamp': datetime.now().isoformat(),
             'server_url': self.server_url,
@@ -298,13 +836,16 @@ class NebulaBenchmark:
             'measurements': []
         }
         
-        # Prepare file (WSL optimization)
+        # Prepare file (WSL optimization). A temp copy has the same size, so the
+        # metadata gathered above is reused rather than stat()ing again.
         actual_path, temp_path = self.prepare_file(file_path)
-        file_info = self.get_file_info(actual_path)
+        file_info = results['file_info']
+        
+        self.warm_up()
         
         try:
             # 1. Upload benchmark
-            upload_result = self.benchmark_upload(actual_path)
+            upload_result = self.benchmark_upload(actual_path, file_info=file_info)
             results['measurements'].append(upload_result)
             
             if not upload_result['success'] or not upload_result.get('file_id'):
@@ -318,19 +859,44 @@ class NebulaBenchmark:
             download_result = self.benchmark_download(file_id, file_size_mb)
             results['measurements'].append(download_result)
             
-            # 3. Stream full file benchmark
-            stream_full_result = self.benchmark_stream(file_id, file_size_mb)
-            results['measurements'].append(stream_full_result)
+            if download_to_null:
+                results['measurements'].append(self.benchmark_download_null(file_id, file_size_mb))
             
-            # 4. Stream range benchmark (first 50MB or file size, whichever is smaller)
+            # Stream range benchmark covers the first 50MB or file size, whichever is smaller
             range_bytes = min(50 * 1024 * 1024, int(file_size_mb * 1024 * 1024))
-            stream_range_result = self.benchmark_stream(file_id, file_size_mb, range_bytes)
-            results['measurements'].append(stream_range_result)
             
-            # 5. Transcode benchmark (optional)
-            if not skip_transcode:
-                transcode_result = self.benchmark_transcode(file_id, [480])
-                results['measurements'].append(transcode_result)
+            with ThreadPoolExecutor(max_workers=2) as phase_pool:
+                # Transcode runs on the server, and the range stream reads the same
+                # object as the full stream, so both can overlap it
+                transcode_future = range_future = None
+                if parallel_phases:
+                    if not skip_transcode:
+                        transcode_future = phase_pool.submit(self.benchmark_transcode, file_id, [480])
+                    range_future = phase_pool.submit(
+                        self.benchmark_stream, file_id, file_size_mb, range_bytes, progress=False
+                    )
+                
+                # 3. Stream full file benchmark
+                stream_full_result = self.benchmark_stream(file_id, file_size_mb)
+                results['measurements'].append(stream_full_result)
+                
+                # 4. Stream range benchmark
+                if range_future is not None:
+                    stream_range_result = range_future.result()
+                else:
+                    stream_range_result = self.benchmark_stream(file_id, file_size_mb, range_bytes)
+                results['measurements'].append(stream_range_result)
+                
+                # Aggregate throughput across concurrent streams (optional)
+                if parallel_streams > 1:
+                    results['measurements'].append(self.benchmark_parallel_streams(file_id, parallel_streams))
+                
+                # 5. Transcode benchmark (optional)
+                if transcode_future is not None:
+                    results['measurements'].append(transcode_future.result())
+                elif not skip_transcode:
+                    transcode_result = self.benchmark_transcode(file_id, [480])
+                    results['measurements'].append(transcode_result)
             
         finally:
             # Cleanup temp file
@@ -371,8 +937,12 @@ class NebulaBenchmark:
                     print(f"   Data: {m['size_mb']:.1f} MB")
                 if 'duration_seconds' in m:
                     print(f"   Duration: {m['duration_seconds']:.2f}s")
+                if 'streams' in m:
+                    print(f"   Streams: {m['streams']} concurrent")
                 if 'completed_jobs' in m:
                     print(f"   Jobs: {m['completed_jobs']} completed, {m.get('failed_jobs', 0)} failed")
+                if m.get('avg_job_seconds') is not None:
+                    print(f"   Avg job time (server): {m['avg_job_seconds']:.1f}s")
             else:
                 print(f"   Error: {m.get('error', 'Unknown error')}")
         
@@ -383,9 +953,16 @@ class NebulaBenchmark:
         
         measurements = {m['operation']: m for m in results['measurements']}
         
+        summary = summarize_throughput(results['measurements'])
+        if summary:
+            print(f"\n📈 Throughput across {summary['count']} transfers: "
+                  f"median {summary['median_mbps']:.1f} Mbps, p95 {summary['p95_mbps']:.1f} Mbps")
+        
         upload = measurements.get('upload')
         download = measurements.get('download')
         stream = measurements.get('stream_full')
+        stream_parallel = measurements.get('stream_parallel')
+        download_null = measurements.get('download_null')
         
         if upload and download and upload['success'] and download['success']:
             ratio = download['throughput_mbps'] / upload['throughput_mbps'] if upload['throughput_mbps'] > 0 else 0
@@ -396,12 +973,23 @@ class NebulaBenchmark:
             elif ratio > 1.5:
                 print("   → Download faster: Upload may be network-limited")
         
+        if download and download_null and download['success'] and download_null['success']:
+            print(f"\n🕳️  Download (to null): {download_null['throughput_mbps']:.1f} Mbps")
+            if download['throughput_mbps'] < download_null['throughput_mbps'] * 0.8:
+                print("   → Writing to disk costs more than 20%: Local storage is limiting downloads")
+        
         if download and stream and download['success'] and stream['success']:
             ratio = stream['throughput_mbps'] / download['throughput_mbps'] if download['throughput_mbps'] > 0 else 0
             print(f"\n🎬 Stream: {stream['throughput_mbps']:.1f} Mbps")
             if ratio < 0.9:
                 print(f"   → Streaming {(1-ratio)*100:.0f}% slower than download: Range handling overhead")
         
+        if stream and stream_parallel and stream['success'] and stream_parallel['success']:
+            scale = stream_parallel['throughput_mbps'] / stream['throughput_mbps'] if stream['throughput_mbps'] > 0 else 0
+            print(f"\n🔀 {stream_parallel['streams']} parallel streams: {stream_parallel['throughput_mbps']:.1f} Mbps ({scale:.1f}x single stream)")
+            if scale < 1.2:
+                print("   → Little gain from concurrency: Server or disk is the bottleneck, not a single connection")
+        
         print("\n" + "=" * 70)
 
 
@@ -421,6 +1009,13 @@ Examples:
     parser.add_argument("--skip-transcode", action="store_true", help="Skip transcoding benchmark")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     parser.add_argument("--output", "-o", help="Save results to JSON file")
+    parser.add_argument("--no-progress", action="store_true", help="Disable progress bars while streaming (lower client CPU overhead)")
+    parser.add_argument("--subprocess", action="store_true", help="Run upload/download through the nebula executable instead of in-process")
+    parser.add_argument("--tqdm", action="store_true", help="Use tqdm progress bars instead of the lightweight progress line")
+    parser.add_argument("--zero-copy-upload", action="store_true", help="Upload with sendfile(2) over a raw socket instead of the CLI (http:// only)")
+    parser.add_argument("--parallel-phases", action="store_true", help="Overlap the range stream and transcoding with the full stream (faster, but phases are not measured in isolation)")
+    parser.add_argument("--download-to-null", action="store_true", help="Also measure the download with bytes discarded instead of written to disk")
+    parser.add_argument("--parallel-streams", type=int, default=1, metavar="N", help="Also measure aggregate throughput of N concurrent full-file streams")
     
     args = parser.parse_args()
     
@@ -432,8 +1027,9 @@ Examples:
         print(f"❌ File not found: {args.file_path}")
         sys.exit(1)
     
-    # Check nebula CLI is available
-    if not shutil.which("nebula"):
+    # Check nebula CLI is available (only needed when shelling out)
+    use_subprocess = args.subprocess or not CLI_IN_PROCESS
+    if use_subprocess and not shutil.which("nebula"):
         print("❌ 'nebula' CLI not found. Make sure it's installed and in PATH.")
         sys.exit(1)
     
@@ -441,15 +1037,31 @@ Examples:
     print(f"📁 File: {args.file_path}")
     print(f"🔗 Server: {server_url}")
     
-    benchmark = NebulaBenchmark(server_url, args.verbose)
+    benchmark = NebulaBenchmark(
+        server_url,
+        args.verbose,
+        progress=not args.no_progress,
+        zero_copy_upload=args.zero_copy_upload,
+        use_tqdm=args.tqdm,
+        use_subprocess=use_subprocess
+    )
     
     try:
-        results = benchmark.run_full_benchmark(args.file_path, skip_transcode=args.skip_transcode)
+        results = benchmark.run_full_benchmark(
+            args.file_path,
+            skip_transcode=args.skip_transcode,
+            parallel_phases=args.parallel_phases,
+            parallel_streams=args.parallel_streams,
+            download_to_null=args.download_to_null
+        )
         benchmark.print_report(results)
         
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+            if orjson is not None:
+                Path(args.output).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
+            else:
+                with open(args.output, 'w') as f:
+                    json.dump(results, f, indent=2, default=str)
             print(f"\n💾 Results saved to: {args.output}")
             
     except KeyboardInterrupt:
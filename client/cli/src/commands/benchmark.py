@@ -17,7 +17,14 @@ def run_benchmark(
     server_url: Optional[str] = None,
     output: Optional[str] = None,
     verbose: bool = False,
-    skip_transcode: bool = False
+    skip_transcode: bool = False,
+    no_progress: bool = False,
+    parallel_phases: bool = False,
+    zero_copy_upload: bool = False,
+    use_tqdm: bool = False,
+    use_subprocess: bool = False,
+    parallel_streams: int = 1,
+    download_to_null: bool = False
 ):
     """
     Run the Nebula performance benchmark
@@ -28,6 +35,13 @@ def run_benchmark(
         output: Path to save JSON results (optional)
         verbose: Enable verbose logging
         skip_transcode: Skip transcoding benchmark (faster)
+        no_progress: Disable progress bars while streaming
+        parallel_phases: Overlap the range stream and transcoding with the full stream
+        zero_copy_upload: Upload with sendfile(2) instead of the CLI upload command
+        use_tqdm: Use tqdm progress bars instead of the lightweight progress line
+        use_subprocess: Run upload/download through the nebula executable
+        parallel_streams: Also measure N concurrent full-file streams
+        download_to_null: Also measure the download with bytes discarded
     """
     # Get the benchmark script path (from nebula root directory)
     benchmark_script = Path(__file__).parent.parent.parent.parent.parent / "benchmark.py"
@@ -56,6 +70,34 @@ def run_benchmark(
     if skip_transcode:
         cmd.append("--skip-transcode")
 
+    # Add no-progress flag if requested
+    if no_progress:
+        cmd.append("--no-progress")
+
+    # Add parallel-phases flag if requested
+    if parallel_phases:
+        cmd.append("--parallel-phases")
+
+    # Add zero-copy-upload flag if requested
+    if zero_copy_upload:
+        cmd.append("--zero-copy-upload")
+
+    # Add tqdm flag if requested
+    if use_tqdm:
+        cmd.append("--tqdm")
+
+    # Add subprocess flag if requested
+    if use_subprocess:
+        cmd.append("--subprocess")
+
+    # Add parallel stream count if requested
+    if parallel_streams > 1:
+        cmd.extend(["--parallel-streams", str(parallel_streams)])
+
+    # Add download-to-null flag if requested
+    if download_to_null:
+        cmd.append("--download-to-null")
+
     console.print(f"[blue]🚀 Running benchmark on: {file_path}[/blue]")
     if server_url:
         console.print(f"[blue]🔗 Server: {server_url}[/blue]")
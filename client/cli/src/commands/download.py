@@ -1,27 +1,301 @@
 # Download command - download files from server
 
 import os
-import shutil
-import tempfile
+import hashlib
+import json
+import queue
+import threading
+import time
 import typer
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import httpx
 from rich.console import Console
 from rich.progress import Progress, BarColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
 from urllib.parse import urlparse
+from ..http_client import response_json, response_snippet
 
 console = Console()
 
+# Each parallel range connection fetches at least this many bytes
+PARALLEL_MIN_RANGE_BYTES = 16 * 1024 * 1024
+
+# Read size for batch downloads (override with --chunk-size or NEBULA_DOWNLOAD_CHUNK)
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Received chunks are gathered up to this size and written with one syscall;
+# the progress bar is updated once per batch rather than once per chunk
+WRITE_BATCH_BYTES = 4 * 1024 * 1024
+
+
+def _iov_max() -> int:
+    """Most buffers one pwritev() call accepts (1024 on Linux)."""
+    try:
+        limit = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        limit = -1
+    return limit if limit > 0 else 1024
+
+
+# Small chunks (e.g. --chunk-size 1024) can put more buffers in one batch than
+# a single vectored write takes, so batches are written in groups of this many
+WRITE_IOV_MAX = _iov_max()
+
+# Without a fixed chunk size, bodies are read as the network delivers them and
+# written in batches of about ADAPTIVE_BATCH_SECONDS of data at the estimated
+# throughput, within these bounds
+ADAPTIVE_BATCH_SECONDS = 0.25
+ADAPTIVE_BATCH_MIN_BYTES = 256 * 1024
+ADAPTIVE_BATCH_MAX_BYTES = WRITE_BATCH_BYTES
+
+# Throughput sampling window (seconds), and the weight the running estimate
+# keeps against each new window
+THROUGHPUT_WINDOW_SECONDS = 1.0
+THROUGHPUT_SMOOTHING = 0.9
+
+# File bodies are requested unencoded so byte counts match Content-Length and offsets
+IDENTITY_ENCODING = {'Accept-Encoding': 'identity'}
+
+# Batches the single-stream download may buffer ahead of its disk writer
+WRITE_QUEUE_BATCHES = 4
+
+# File metadata from earlier downloads, revalidated with its ETag instead of refetched
+FILE_INFO_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "nebula", "files.json")
+FILE_INFO_CACHE_ENTRIES = 256
+# Batch workers share the cache file; each read-modify-write holds this lock
+_file_info_cache_lock = threading.Lock()
+
+
+# Batch downloads: files fetched at once (override with --jobs or NEBULA_DOWNLOAD_JOBS),
+# and attempts per file, each resuming from what the previous one wrote
+DOWNLOAD_JOBS = 4
+DOWNLOAD_ATTEMPTS = 3
+
+# Suffix of a file still being downloaded by a batch; kept on failure so a rerun resumes it
+PARTIAL_SUFFIX = ".part"
+
+
+def _split_ranges(total_size: int, connections: int) -> List[Tuple[int, int]]:
+    """Split [0, total_size) into at most `connections` inclusive byte ranges."""
+    if total_size <= 0:
+        return []  # Nothing to split; an empty file is streamed (created) as is
+    connections = max(1, min(connections, total_size // PARALLEL_MIN_RANGE_BYTES))
+    part_size = -(-total_size // connections)
+    return [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+
+
+def _content_range_start(response: httpx.Response) -> Optional[int]:
+    """First byte of a 206 response's Content-Range ('bytes START-END/TOTAL'), or None if unreadable."""
+    unit, _, spec = response.headers.get('content-range', '').partition(' ')
+    start = spec.partition('-')[0]
+    return int(start) if unit == 'bytes' and start.isdigit() else None
+
+
+class _Cancelled(Exception):
+    """Raised inside a download worker once its download has been cancelled."""
+
+
+def _preallocate(fd: int, size: int):
+    """Reserve size bytes for fd, falling back to a sparse file where fallocate isn't supported."""
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except (AttributeError, OSError):
+        os.ftruncate(fd, size)
+
+
+class _WriteBatchSizer:
+    """
+    Write batch size for a download: fixed when a chunk size was given, else
+    adapted to throughput. The estimate is an exponentially smoothed harmonic
+    mean of per-window rates, so short bursts don't inflate it.
+    """
+
+    def __init__(self, fixed_bytes: Optional[int] = None):
+        self.fixed = fixed_bytes is not None
+        self.batch_bytes = fixed_bytes if self.fixed else ADAPTIVE_BATCH_MIN_BYTES
+        self.seconds_per_byte = None
+        self.window_start = time.perf_counter()
+        self.window_bytes = 0
+
+    def add(self, nbytes: int) -> int:
+        """Account for a written batch of nbytes; returns the size for the next one."""
+        if self.fixed:
+            return self.batch_bytes
+        self.window_bytes += nbytes
+        now = time.perf_counter()
+        elapsed = now - self.window_start
+        if elapsed >= THROUGHPUT_WINDOW_SECONDS and self.window_bytes:
+            sample = elapsed / self.window_bytes
+            if self.seconds_per_byte is None:
+                self.seconds_per_byte = sample
+            else:
+                self.seconds_per_byte = THROUGHPUT_SMOOTHING * self.seconds_per_byte + (1 - THROUGHPUT_SMOOTHING) * sample
+            target = ADAPTIVE_BATCH_SECONDS / self.seconds_per_byte
+            self.batch_bytes = int(min(max(target, ADAPTIVE_BATCH_MIN_BYTES), ADAPTIVE_BATCH_MAX_BYTES))
+            self.window_start = now
+            self.window_bytes = 0
+        return self.batch_bytes
+
+
+def _iter_body(response: httpx.Response, chunk_size: Optional[int]):
+    """The response body re-chunked to chunk_size, or as the network delivers it when unset."""
+    if chunk_size is None and response.headers.get('content-encoding', 'identity') == 'identity':
+        # No decoder and no re-chunking copy; the batches below set the write size
+        return response.iter_raw()
+    return response.iter_bytes(chunk_size=chunk_size)
+
+
+def _write_batch(fd: int, buffers: List[bytes], offset: int):
+    """Write buffers at offset, in vectored syscalls (up to WRITE_IOV_MAX buffers each) where the OS supports it."""
+    if not hasattr(os, 'pwritev'):
+        _write_all(fd, memoryview(b''.join(buffers)), offset)
+        return
+    for start in range(0, len(buffers), WRITE_IOV_MAX):
+        group = buffers[start:start + WRITE_IOV_MAX]
+        size = sum(map(len, group))
+        written = os.pwritev(fd, group, offset)
+        if written < size:
+            _write_all(fd, memoryview(b''.join(group))[written:], offset + written)
+        offset += size
+
+
+def _write_all(fd: int, data: memoryview, offset: int):
+    """Write data at offset one call at a time (short writes, and platforms without pwritev)."""
+    while data:
+        written = os.pwrite(fd, data, offset) if hasattr(os, 'pwrite') else os.write(fd, data)
+        data = data[written:]
+        offset += written
+
+
+def _load_file_info_cache() -> dict:
+    """Cached file metadata keyed on 'server_url|file_id' ({} if missing or unreadable)."""
+    try:
+        with open(FILE_INFO_CACHE_FILE) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_file_info_cache(cache: dict):
+    """
+    Persist the metadata cache, keeping only the most recently stored entries.
+    Written to a temp file and renamed into place, so a reader never sees half of it.
+    """
+    for key in list(cache)[:-FILE_INFO_CACHE_ENTRIES]:
+        del cache[key]
+    temp_file = f"{FILE_INFO_CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(FILE_INFO_CACHE_FILE), exist_ok=True)
+        with open(temp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, FILE_INFO_CACHE_FILE)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=1)
+def _default_download_dir() -> Path:
+    """Where downloads go when no output path is given (NEBULA_DOWNLOAD_DIR, else ~/Downloads/nebula); created on first use."""
+    directory = Path(os.getenv("NEBULA_DOWNLOAD_DIR") or Path.home() / "Downloads" / "nebula").expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def _fetch_file_info(client: httpx.Client, server_url: str, file_id: int) -> dict:
+    """
+    Get a file's metadata. Metadata seen before is revalidated with its ETag,
+    so an unchanged file costs a 304.
+    """
+    cache_key = f"{server_url.rstrip('/')}|{file_id}"
+    with _file_info_cache_lock:
+        cached = _load_file_info_cache().get(cache_key)
+    headers = {'If-None-Match': cached['etag']} if cached else None
+    info_response = client.get(f"{server_url}/api/files/{file_id}", headers=headers, timeout=30.0)
+    if info_response.status_code == 304 and cached:
+        return cached['file']
+
+    info_response.raise_for_status()
+    file_info = response_json(info_response)['file']
+    etag = info_response.headers.get('etag')
+    if etag:
+        # Reloaded under the lock, so entries other workers saved meanwhile are kept
+        with _file_info_cache_lock:
+            info_cache = _load_file_info_cache()
+            info_cache.pop(cache_key, None)
+            info_cache[cache_key] = {'etag': etag, 'file': file_info}
+            _save_file_info_cache(info_cache)
+    return file_info
+
+
+def _file_sha256(path) -> str:
+    """SHA-256 of a file on disk (OpenSSL's hardware-accelerated path where available)."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        while chunk := f.read(WRITE_BATCH_BYTES):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class _BackgroundWriter:
+    """Writes batches on a separate thread so slow disks (e.g. /mnt/c/) overlap the network.
+
+    Batches must arrive in file order when a digest is given: each one is
+    hashed right after it is written, while still in memory.
+    """
+
+    # This is the asynchronous write-back path. At one pwritev per 4 MiB batch,
+    # submission cost is already negligible next to the network, so an io_uring
+    # ring (and the extra native dependency) would buy nothing measurable here.
+
+    def __init__(self, fd: int, digest=None):
+        self.fd = fd
+        self.digest = digest
+        self.queue = queue.Queue(maxsize=WRITE_QUEUE_BATCHES)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while (item := self.queue.get()) is not None:
+            if self.error is None:
+                try:
+                    _write_batch(self.fd, *item)
+                    if self.digest is not None:
+                        for buffer in item[0]:
+                            self.digest.update(buffer)
+                except Exception as e:
+                    # Keep draining so the producer never blocks on a full queue
+                    self.error = e
+
+    def write(self, buffers: List[bytes], offset: int):
+        if self.error is not None:
+            raise self.error
+        self.queue.put((buffers, offset))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
 def download_file(
     file_id: int = typer.Argument(..., help="ID of the file to download"),
     output_path: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path (defaults to original filename)"),
-    server_url: Optional[str] = None
+    server_url: Optional[str] = None,
+    connections: Optional[int] = None,
+    chunk_size: Optional[int] = None
 ):
     """
     Download a file from Nebula Cloud by its ID.
 
     Preserves the original filename if no output path is specified.
+    Large files are fetched over several parallel byte-range connections.
     """
     # Load server URL from environment if not provided
     if not server_url:
@@ -30,16 +304,34 @@ def download_file(
             console.print("[red]❌ Error: NEBULA_SERVER_URL environment variable not set[/red]")
             raise typer.Exit(1)
 
+    if connections is None:
+        connections = int(os.getenv("NEBULA_DOWNLOAD_CONNECTIONS", "4"))
+
+    # No chunk size means adaptive batching
+    if chunk_size is None and os.getenv("NEBULA_DOWNLOAD_CHUNK"):
+        chunk_size = int(os.getenv("NEBULA_DOWNLOAD_CHUNK"))
+    if chunk_size is not None and chunk_size <= 0:
+        console.print("[red]❌ Chunk size must be a positive number of bytes[/red]")
+        raise typer.Exit(1)
+    # A fixed batch always holds at least one chunk
+    fixed_batch_size = max(WRITE_BATCH_BYTES, chunk_size) if chunk_size else None
+
     console.print(f"[yellow]📥 Downloading file ID {file_id}...[/yellow]")
 
+    # One pooled client for the whole flow: the metadata, presign and data requests
+    # reuse keep-alive connections instead of handshaking for each step. Timeouts
+    # are tightened per request for the small API calls.
+    client = httpx.Client(
+        transport=httpx.HTTPTransport(
+            retries=1,
+            limits=httpx.Limits(max_connections=max(connections, 1), max_keepalive_connections=8)
+        ),
+        timeout=httpx.Timeout(connect=10.0, read=7200.0, write=30.0, pool=None)
+    )
+
     try:
         # First, get file info to show metadata before download
-        with httpx.Client(timeout=30.0) as client:
-            # Get file metadata
-            info_response = client.get(f"{server_url}/api/files/{file_id}")
-            info_response.raise_for_status()
-            result = info_response.json()
-            file_info = result['file']
+        file_info = _fetch_file_info(client, server_url, file_id)
 
         console.print(f"[blue]📄 File:[/blue] {file_info['filename']}")
         console.print(f"[blue]📊 Size:[/blue] {file_info['size']:,} bytes")
@@ -52,9 +344,7 @@ def download_file(
             output_file = Path(output_path)
         else:
             # Default download location
-            default_dir = Path("/mnt/c/Users/abhin/Desktop/nebula")
-            default_dir.mkdir(parents=True, exist_ok=True)
-            output_file = default_dir / file_info['filename']
+            output_file = _default_download_dir() / file_info['filename']
 
         # Check if output file already exists
         if output_file.exists():
@@ -64,130 +354,216 @@ def download_file(
                 console.print("[yellow]Download cancelled.[/yellow]")
                 return
 
-        # WSL optimization: Download to Linux temp first, then copy to Windows filesystem
-        # This avoids slow I/O when writing directly to /mnt/c/
-        use_temp = str(output_file).startswith('/mnt/')
-        temp_file = None
-        
-        if use_temp:
-            temp_dir = tempfile.gettempdir()
-            temp_file = Path(temp_dir) / f"nebula_download_{os.getpid()}_{file_info['filename']}"
-            download_target = temp_file
-            console.print(f"[dim]WSL optimization: Downloading to Linux temp first...[/dim]")
-        else:
-            download_target = output_file
-
-        console.print(f"[yellow]🚀 Downloading to {output_file.absolute()}...[/yellow]")
+        abs_path = output_file.absolute()
+        console.print(f"[yellow]🚀 Downloading to {abs_path}...[/yellow]")
 
+        # Prefer presigned download URL (bypass API for data path). Fallback to /download.
+        proxy_url = f"{server_url}/api/files/{file_id}/download"
+        download_url = proxy_url
+        used_presigned = False
         try:
-            # Prefer presigned download URL (bypass API for data path). Fallback to /download.
-            proxy_url = f"{server_url}/api/files/{file_id}/download"
-            download_url = proxy_url
-            used_presigned = False
-            try:
-                # Determine whether we should request local vs remote presign, using the same
-                # "local if reachable else remote" pattern from the CLI main URL selection.
-                # Prefer explicit match to env URLs, otherwise infer from server_url hostname.
-                local_url = os.getenv("NEBULA_LOCAL_URL", "").strip().rstrip("/")
-                remote_url = os.getenv("NEBULA_REMOTE_URL", "").strip().rstrip("/")
-                current = (server_url or "").strip().rstrip("/")
-
-                network = None
-                if local_url and current == local_url:
-                    network = "local"
-                elif remote_url and current == remote_url:
+            # Determine whether we should request local vs remote presign, using the same
+            # "local if reachable else remote" pattern from the CLI main URL selection.
+            # Prefer explicit match to env URLs, otherwise infer from server_url hostname.
+            local_url = os.getenv("NEBULA_LOCAL_URL", "").strip().rstrip("/")
+            remote_url = os.getenv("NEBULA_REMOTE_URL", "").strip().rstrip("/")
+            current = (server_url or "").strip().rstrip("/")
+
+            network = None
+            if local_url and current == local_url:
+                network = "local"
+            elif remote_url and current == remote_url:
+                network = "remote"
+            else:
+                host = urlparse(current).hostname or ""
+                if host.startswith("100.") or host.startswith("fd7a:"):
                     network = "remote"
-                else:
-                    host = urlparse(current).hostname or ""
-                    if host.startswith("100.") or host.startswith("fd7a:"):
-                        network = "remote"
-                    elif host.startswith("192.168.") or host.startswith("10.") or host.startswith("172."):
-                        network = "local"
-
-                with httpx.Client(timeout=10.0) as client:
-                    presign_url = f"{server_url}/api/files/{file_id}/download-url"
-                    if network:
-                        presign_url = f"{presign_url}?network={network}"
-                    presign_resp = client.get(presign_url)
-                    if presign_resp.status_code == 200:
-                        presign_data = presign_resp.json()
-                        if presign_data.get("success") and presign_data.get("url"):
-                            candidate = presign_data["url"]
-                            host = urlparse(candidate).hostname
-                            # Guardrail: if we accidentally presigned with docker-internal hostname, it won't resolve on clients.
-                            if host and host.lower() in ("s3", "minio"):
-                                pass
-                            else:
-                                download_url = candidate
-                                used_presigned = True
-                                console.print("[dim]⚡ Using direct MinIO download (presigned URL)[/dim]")
-            except Exception:
-                # Silent fallback
-                pass
+                elif host.startswith("192.168.") or host.startswith("10.") or host.startswith("172."):
+                    network = "local"
 
-            def _stream_to_file(url: str):
-                with httpx.Client(timeout=7200.0) as client:  # 2 hour timeout for large files
-                    with client.stream('GET', url) as response:
-                        response.raise_for_status()
-
-                        # Get total size from response headers
-                        total_size = int(response.headers.get('content-length', file_info['size']))
-
-                        # Create progress bar
-                        with Progress(
-                            BarColumn(),
-                            "[progress.percentage]{task.percentage:>3.0f}%",
-                            DownloadColumn(),
-                            TransferSpeedColumn(),
-                            TimeRemainingColumn(),
-                            console=console
-                        ) as progress:
-                            task = progress.add_task("Downloading...", total=total_size)
-
-                            # Download and save file
-                            with open(download_target, 'wb') as f:
-                                downloaded = 0
-                                for chunk in response.iter_bytes(chunk_size=1024 * 1024):
-                                    f.write(chunk)
-                                    downloaded += len(chunk)
-                                    progress.update(task, completed=downloaded)
+            presign_url = f"{server_url}/api/files/{file_id}/download-url"
+            if network:
+                presign_url = f"{presign_url}?network={network}"
+            presign_resp = client.get(presign_url, timeout=10.0)
+            if presign_resp.status_code == 200:
+                presign_data = response_json(presign_resp)
+                if presign_data.get("success") and presign_data.get("url"):
+                    candidate = presign_data["url"]
+                    host = urlparse(candidate).hostname
+                    # Guardrail: if we accidentally presigned with docker-internal hostname, it won't resolve on clients.
+                    if host and host.lower() in ("s3", "minio"):
+                        pass
+                    else:
+                        download_url = candidate
+                        used_presigned = True
+                        console.print("[dim]⚡ Using direct MinIO download (presigned URL)[/dim]")
+        except Exception:
+            # Silent fallback
+            pass
 
+        # SHA-256 recorded at upload, when the server has hashing enabled
+        expected_hash = file_info.get('file_hash')
+
+        def _stream_to_file(url: str) -> Optional[str]:
+            """Download url sequentially; returns the SHA-256 of the bytes written if one is expected."""
+            with client.stream('GET', url, headers=IDENTITY_ENCODING) as response:
+                response.raise_for_status()
+
+                # Get total size from response headers
+                total_size = int(response.headers.get('content-length', file_info['size']))
+
+                # Create progress bar
+                with Progress(
+                    BarColumn(),
+                    "[progress.percentage]{task.percentage:>3.0f}%",
+                    DownloadColumn(),
+                    TransferSpeedColumn(),
+                    TimeRemainingColumn(),
+                    console=console
+                ) as progress:
+                    task = progress.add_task("Downloading...", total=total_size)
+
+                    # Write straight to the destination, preallocated so the
+                    # filesystem can lay the file out in one piece
+                    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    writer = None
+                    try:
+                        if total_size:
+                            _preallocate(fd, total_size)
+                        writer = _BackgroundWriter(fd, hashlib.sha256() if expected_hash else None)
+                        downloaded = 0
+                        written = 0
+                        pending = []
+                        sizer = _WriteBatchSizer(fixed_batch_size)
+                        batch_bytes = sizer.batch_bytes  # local: read on every chunk
+                        for chunk in _iter_body(response, chunk_size):
+                            pending.append(chunk)
+                            downloaded += len(chunk)
+                            if downloaded - written >= batch_bytes:
+                                writer.write(pending, written)
+                                batch_bytes = sizer.add(downloaded - written)
+                                pending = []
+                                written = downloaded
+                                # httpx keeps its own byte count; no separate tally for the bar
+                                progress.update(task, completed=response.num_bytes_downloaded)
+                        if pending:
+                            writer.write(pending, written)
+                        progress.update(task, completed=response.num_bytes_downloaded)
+                    finally:
+                        # Always stop the writer before the fd goes away
+                        try:
+                            if writer is not None:
+                                writer.close()
+                        finally:
+                            os.close(fd)
+
+                # The file is preallocated, so its size can't reveal a short transfer
+                if downloaded != total_size:
+                    raise RuntimeError(f"Transfer ended early at byte {downloaded:,} of {total_size:,}")
+                return writer.digest.hexdigest() if writer.digest is not None else None
+
+        def _download_ranges(url: str, ranges: List[Tuple[int, int]]):
+            # Preallocate the target and let each connection write its own slice in place
+            fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
             try:
-                _stream_to_file(download_url)
-            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
-                # If direct MinIO URL isn't reachable from this client (common when remote),
-                # fall back to API-proxied download so the user flow still works.
-                if used_presigned:
-                    console.print(f"[yellow]⚠️  Direct MinIO download failed ({e}). Falling back to API download...[/yellow]")
-                    _stream_to_file(proxy_url)
-                else:
-                    raise
+                _preallocate(fd, file_info['size'])
+                with Progress(
+                    BarColumn(),
+                    "[progress.percentage]{task.percentage:>3.0f}%",
+                    DownloadColumn(),
+                    TransferSpeedColumn(),
+                    TimeRemainingColumn(),
+                    console=console
+                ) as progress:
+                    task = progress.add_task(f"Downloading ({len(ranges)} connections)...", total=file_info['size'])
+                    # Set when one range fails or the user interrupts; the
+                    # others then stop at their next chunk
+                    cancel = threading.Event()
 
-            # If we used temp file, copy to final destination
-            if use_temp and temp_file and temp_file.exists():
-                console.print(f"[dim]Copying to Windows filesystem...[/dim]")
-                shutil.copy2(temp_file, output_file)
-        finally:
-            # Clean up temp file
-            if temp_file and temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except Exception:
-                    pass
+                    def _fetch_range(start: int, end: int):
+                        headers = {'Range': f'bytes={start}-{end}', **IDENTITY_ENCODING}
+                        with client.stream('GET', url, headers=headers) as response:
+                            response.raise_for_status()
+                            if response.status_code != 206:
+                                raise RuntimeError(f"Server ignored Range request (HTTP {response.status_code})")
+                            offset = start
+                            written = start
+                            pending = []
+                            sizer = _WriteBatchSizer(fixed_batch_size)
+                            batch_bytes = sizer.batch_bytes  # local: read on every chunk
+                            for chunk in _iter_body(response, chunk_size):
+                                if cancel.is_set():
+                                    raise _Cancelled()
+                                pending.append(chunk)
+                                offset += len(chunk)
+                                if offset - written >= batch_bytes:
+                                    _write_batch(fd, pending, written)
+                                    progress.advance(task, offset - written)
+                                    batch_bytes = sizer.add(offset - written)
+                                    pending = []
+                                    written = offset
+                            if pending:
+                                _write_batch(fd, pending, written)
+                                progress.advance(task, offset - written)
+                        if offset != end + 1:
+                            raise RuntimeError(f"Range {start}-{end} ended early at byte {offset}")
 
-        # Verify download
-        if output_file.exists():
-            actual_size = output_file.stat().st_size
-            if actual_size == file_info['size']:
-                console.print(f"[green]✅ Download complete![/green] Saved to {output_file.absolute()}")
-                console.print(f"[green]📁 File size:[/green] {actual_size:,} bytes")
+                    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+                        futures = [pool.submit(_fetch_range, start, end) for start, end in ranges]
+                        try:
+                            # In completion order, so the first failure is seen at once
+                            for future in as_completed(futures):
+                                future.result()
+                        except BaseException:
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            cancel.set()
+                            raise
+            finally:
+                os.close(fd)
+
+        def _fetch(url: str, range_url: str) -> Optional[str]:
+            ranges = _split_ranges(file_info['size'], connections)
+            if len(ranges) > 1 and hasattr(os, 'pwrite'):
+                # Ranges land out of order, so these are hashed from disk afterwards
+                _download_ranges(range_url, ranges)
+                return None
+            return _stream_to_file(url)
+
+        # The API's /download route sends whole files; its /stream route serves byte ranges
+        proxy_range_url = f"{server_url}/api/files/{file_id}/stream"
+
+        try:
+            received_hash = _fetch(download_url, download_url if used_presigned else proxy_range_url)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
+            # If direct MinIO URL isn't reachable from this client (common when remote),
+            # fall back to API-proxied download so the user flow still works.
+            if used_presigned:
+                console.print(f"[yellow]⚠️  Direct MinIO download failed ({e}). Falling back to API download...[/yellow]")
+                received_hash = _fetch(proxy_url, proxy_range_url)
             else:
-                console.print(f"[red]❌ Download incomplete! Expected {file_info['size']:,} bytes, got {actual_size:,} bytes[/red]")
-                raise typer.Exit(1)
-        else:
+                raise
+
+        # Verify download; one stat tells both whether the file exists and its size
+        try:
+            actual_size = os.stat(output_file).st_size
+        except FileNotFoundError:
             console.print("[red]❌ Download failed - file not saved[/red]")
             raise typer.Exit(1)
+        if actual_size != file_info['size']:
+            console.print(f"[red]❌ Download incomplete! Expected {file_info['size']:,} bytes, got {actual_size:,} bytes[/red]")
+            raise typer.Exit(1)
+        if expected_hash:
+            received_hash = received_hash or _file_sha256(output_file)
+            if received_hash != expected_hash.lower():
+                console.print(f"[red]❌ Checksum mismatch! Expected SHA-256 {expected_hash}, got {received_hash}[/red]")
+                raise typer.Exit(1)
+        console.print(f"[green]✅ Download complete![/green] Saved to {abs_path}")
+        console.print(f"[green]📁 File size:[/green] {actual_size:,} bytes")
+        if expected_hash:
+            console.print("[green]🔒 SHA-256 verified[/green]")
 
+    except typer.Exit:
+        raise
     except httpx.TimeoutException:
         console.print("[red]❌ Download timeout (2 hour limit reached)[/red]")
         console.print("[yellow]💡 Check network connection or try again[/yellow]")
@@ -196,15 +572,208 @@ def download_file(
         if e.response.status_code == 404:
             console.print(f"[red]❌ File with ID {file_id} not found[/red]")
         else:
-            console.print(f"[red]❌ Server error: {e.response.status_code} {e.response.text}[/red]")
+            console.print(f"[red]❌ Server error: {e.response.status_code} {response_snippet(e.response)}[/red]")
         raise typer.Exit(1)
     except KeyboardInterrupt:
         console.print("\n[yellow]Download interrupted by user.[/yellow]")
         # Clean up partial file if it exists
-        if 'output_file' in locals() and output_file.exists():
-            output_file.unlink()
-            console.print(f"[yellow]Cleaned up partial file: {output_file}[/yellow]")
+        if 'output_file' in locals():
+            try:
+                output_file.unlink()
+                console.print(f"[yellow]Cleaned up partial file: {output_file}[/yellow]")
+            except FileNotFoundError:
+                pass
         raise typer.Exit(1)
     except Exception as e:
         console.print(f"[red]❌ Download failed: {str(e)}[/red]")
         raise typer.Exit(1)
+    finally:
+        client.close()
+
+
+def _download_to_dir(
+    client: httpx.Client,
+    server_url: str,
+    file_id: int,
+    output_dir: Path,
+    progress: Progress,
+    chunk_size: int,
+    claimed: dict,
+    cancel: threading.Event
+) -> str:
+    """
+    Download one file of a batch into output_dir, resuming a partial file left
+    by an earlier attempt. Returns a short status for the summary.
+
+    claimed maps destination paths to the file IDs writing them, so two files
+    of a batch with the same name don't share a partial file. Setting cancel
+    stops the download at its next chunk, keeping the partial file.
+    """
+    file_info = _fetch_file_info(client, server_url, file_id)
+    output_file = output_dir / file_info['filename']
+    partial_file = output_file.with_name(output_file.name + PARTIAL_SUFFIX)
+    if claimed.setdefault(output_file, file_id) != file_id:
+        raise RuntimeError(f"same filename as file {claimed[output_file]} in this batch; download it separately with --output")
+    size = file_info['size']
+
+    try:
+        existing = os.stat(output_file).st_size
+    except FileNotFoundError:
+        existing = None
+    if existing is not None:
+        if existing == size:
+            return f"already downloaded ({output_file})"
+        raise RuntimeError(f"{output_file} already exists with a different size; remove it to download again")
+
+    task = progress.add_task(file_info['filename'], total=size)
+    if not size:
+        partial_file.touch()  # Nothing to fetch, but the checks below expect the file
+    # The /stream route serves byte ranges, which is what makes resuming possible
+    url = f"{server_url}/api/files/{file_id}/stream"
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        if cancel.is_set():
+            raise _Cancelled()
+        try:
+            offset = os.stat(partial_file).st_size
+        except FileNotFoundError:
+            offset = 0
+        if offset > size:
+            offset = 0
+        progress.update(task, completed=offset)
+
+        headers = dict(IDENTITY_ENCODING)
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+        try:
+            if offset < size:
+                with client.stream('GET', url, headers=headers) as response:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        offset = 0  # Range ignored: the full body is coming, start over
+                        progress.update(task, completed=0)
+                    elif offset and _content_range_start(response) != offset:
+                        # Not the bytes asked for; appending them would corrupt
+                        # the file, so drop it and download from the start
+                        partial_file.unlink(missing_ok=True)
+                        continue
+                    with open(partial_file, 'ab' if offset else 'wb') as f:
+                        write = f.write
+                        for chunk in response.iter_bytes(chunk_size=chunk_size):
+                            if cancel.is_set():
+                                raise _Cancelled()
+                            write(chunk)
+                            progress.advance(task, len(chunk))
+            break
+        except httpx.TransportError:
+            if attempt == DOWNLOAD_ATTEMPTS:
+                raise
+
+    received = os.stat(partial_file).st_size
+    if received != size:
+        raise RuntimeError(f"expected {size:,} bytes, got {received:,}")
+    expected_hash = file_info.get('file_hash')
+    if expected_hash and _file_sha256(partial_file) != expected_hash.lower():
+        partial_file.unlink(missing_ok=True)
+        raise RuntimeError("SHA-256 mismatch")
+    os.replace(partial_file, output_file)
+    return f"saved to {output_file}"
+
+
+def download_files(
+    file_ids: List[int],
+    output_dir: Optional[str] = None,
+    server_url: Optional[str] = None,
+    jobs: Optional[int] = None,
+    chunk_size: Optional[int] = None
+):
+    """
+    Download several files from Nebula Cloud concurrently.
+
+    All files share one connection pool. Each file streams into a partial
+    file next to its destination; dropped connections are retried from where
+    they stopped, and partial files left by an interrupted run are resumed
+    by the next one.
+    """
+    # Load server URL from environment if not provided
+    if not server_url:
+        server_url = os.getenv("NEBULA_SERVER_URL")
+        if not server_url:
+            console.print("[red]❌ Error: NEBULA_SERVER_URL environment variable not set[/red]")
+            raise typer.Exit(1)
+
+    file_ids = list(dict.fromkeys(file_ids))  # each file once, in the order given
+    if jobs is None:
+        jobs = int(os.getenv("NEBULA_DOWNLOAD_JOBS", str(DOWNLOAD_JOBS)))
+    jobs = max(1, min(jobs, len(file_ids)))
+    if chunk_size is None:
+        chunk_size = int(os.getenv("NEBULA_DOWNLOAD_CHUNK", str(DOWNLOAD_CHUNK_BYTES)))
+
+    if output_dir:
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+    else:
+        directory = _default_download_dir()
+
+    console.print(f"[yellow]📥 Downloading {len(file_ids)} files to {directory.absolute()} ({jobs} at a time)...[/yellow]")
+
+    client = httpx.Client(
+        transport=httpx.HTTPTransport(
+            retries=1,
+            limits=httpx.Limits(max_connections=jobs, max_keepalive_connections=jobs)
+        ),
+        timeout=httpx.Timeout(connect=10.0, read=7200.0, write=30.0, pool=None)
+    )
+
+    failed = 0
+    try:
+        with Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=console
+        ) as progress:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                # dict.setdefault is atomic, which is all the claim check needs
+                claimed = {}
+                cancel = threading.Event()
+                futures = {
+                    file_id: pool.submit(_download_to_dir, client, server_url, file_id, directory, progress, chunk_size, claimed, cancel)
+                    for file_id in file_ids
+                }
+                results = {}
+                try:
+                    for file_id, future in futures.items():
+                        try:
+                            results[file_id] = (True, future.result())
+                        except httpx.HTTPStatusError as e:
+                            if e.response.status_code == 404:
+                                results[file_id] = (False, "not found")
+                            else:
+                                results[file_id] = (False, f"server error {e.response.status_code}")
+                        except Exception as e:
+                            results[file_id] = (False, str(e) or type(e).__name__)
+                except KeyboardInterrupt:
+                    # Drop the queued files and stop the running ones at their
+                    # next chunk; leaving the block then waits only for that
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    cancel.set()
+                    raise
+
+        for file_id, (ok, message) in results.items():
+            if ok:
+                console.print(f"[green]✅ File {file_id}:[/green] {message}")
+            else:
+                failed += 1
+                console.print(f"[red]❌ File {file_id}:[/red] {message}")
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Download interrupted by user. Partial files are kept; run the same command again to resume.[/yellow]")
+        raise typer.Exit(1)
+    finally:
+        client.close()
+
+    if failed:
+        console.print(f"[red]❌ {failed} of {len(file_ids)} downloads failed[/red]")
+        raise typer.Exit(1)
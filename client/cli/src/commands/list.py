@@ -1,14 +1,80 @@
 # List command - display all uploaded files
 
 import typer
-from typing import Optional
+import itertools
+import sys
+from typing import Iterable, Iterator, Optional
 import httpx
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 import os
+from ..http_client import get_client, json_loads, response_json, response_snippet
+from ..utils.format import format_bytes
 
 console = Console()
 
+# Icon per top-level MIME type
+MIME_TYPE_ICONS = {"video": "🎬", "image": "🖼️", "audio": "🎵"}
+
+
+def _iter_listing(response: httpx.Response) -> Iterator[dict]:
+    """Yield files as they arrive: line by line for NDJSON, else from the JSON document (older servers)."""
+    if response.headers.get("content-type", "").startswith("application/x-ndjson"):
+        for line in response.iter_lines():
+            if line:
+                yield json_loads(line)
+    else:
+        response.read()
+        yield from response_json(response).get('files', [])
+
+
+def _render_table(files: Iterable[dict]) -> int:
+    """Show files in a table, adding rows as they arrive. Returns the row count."""
+    # Borderless, like the status tables: Rich spends much of a large table's
+    # render time drawing box edges
+    table = Table(title="📁 Uploaded Files", box=None)
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Filename", style="green")
+    table.add_column("Size", style="magenta", justify="right")
+    table.add_column("Type", style="blue")
+    table.add_column("Uploaded", style="yellow")
+    table.add_column("Description", style="white")
+
+    count = 0
+    with Live(table, console=console, refresh_per_second=10):
+        for file in files:
+            # Format upload date (remove time part for display)
+            upload_date = file['upload_date'][:10] if file['upload_date'] else "Unknown"
+
+            # Get file extension/type info
+            mime_type = file['mime_type']
+            type_icon = MIME_TYPE_ICONS.get(mime_type.partition('/')[0], "📄")
+
+            table.add_row(
+                str(file['id']),
+                file['filename'],
+                format_bytes(file['size']),
+                f"{type_icon} {mime_type}",
+                upload_date,
+                file['description'] or ""
+            )
+            count += 1
+    return count
+
+
+def _write_tsv(files: Iterable[dict]) -> int:
+    """Write one tab-separated line per file (for pipes). Returns the row count."""
+    count = 0
+    write = sys.stdout.write
+    for file in files:
+        fields = (file['id'], file['filename'], file['size'], file['mime_type'],
+                  file['upload_date'] or "", file['description'] or "")
+        write("\t".join(str(field).replace("\t", " ").replace("\n", " ") for field in fields) + "\n")
+        count += 1
+    return count
+
+
 def list_files(
     server_url: Optional[str] = None,
     limit: int = typer.Option(50, help="Maximum number of files to display"),
@@ -16,6 +82,9 @@ def list_files(
 ):
     """
     List all uploaded files with metadata.
+
+    On a terminal, rows are shown as they stream in; when output is piped,
+    files are written as tab-separated lines instead of a table.
     """
     # Load server URL from environment if not provided
     if not server_url:
@@ -24,71 +93,34 @@ def list_files(
             console.print("[red]❌ Error: NEBULA_SERVER_URL environment variable not set[/red]")
             raise typer.Exit(1)
 
-    console.print(f"[yellow]📋 Fetching file list from {server_url}...[/yellow]")
+    # Rich's own terminal detection, so FORCE_TERMINAL/NO_COLOR style overrides apply
+    interactive = console.is_terminal
+    if interactive:
+        console.print(f"[yellow]📋 Fetching file list from {server_url}...[/yellow]")
 
     try:
-        # Fetch file list from server
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(
-                f"{server_url}/api/files",
-                params={"limit": limit, "skip": skip}
-            )
+        # Stream the file list from the server
+        with get_client().stream(
+            "GET",
+            f"{server_url}/api/files",
+            params={"limit": limit, "offset": skip, "format": "ndjson"}
+        ) as response:
+            if response.is_error:
+                response.read()  # so the error handler can show the body
             response.raise_for_status()
 
-        result = response.json()
-        files = result.get('files', [])
-
-        if not files:
-            console.print("[yellow]📂 No files found.[/yellow]")
-            return
-
-        # Create a rich table to display files
-        table = Table(title="📁 Uploaded Files")
-        table.add_column("ID", style="cyan", no_wrap=True)
-        table.add_column("Filename", style="green")
-        table.add_column("Size", style="magenta", justify="right")
-        table.add_column("Type", style="blue")
-        table.add_column("Uploaded", style="yellow")
-        table.add_column("Description", style="white")
-
-        for file in files:
-            # Format file size
-            size_bytes = file['size']
-            if size_bytes < 1024:
-                size_str = f"{size_bytes} B"
-            elif size_bytes < 1024 * 1024:
-                size_str = f"{size_bytes / 1024:.1f} KB"
-            elif size_bytes < 1024 * 1024 * 1024:
-                size_str = f"{size_bytes / (1024 * 1024):.1f} MB"
-            else:
-                size_str = f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
-
-            # Format upload date (remove time part for display)
-            upload_date = file['upload_date'][:10] if file['upload_date'] else "Unknown"
+            files = _iter_listing(response)
+            first = next(files, None)
+            if first is None:
+                if interactive:
+                    console.print("[yellow]📂 No files found.[/yellow]")
+                return
 
-            # Get file extension/type info
-            mime_type = file['mime_type']
-            if mime_type.startswith('video/'):
-                type_icon = "🎬"
-            elif mime_type.startswith('image/'):
-                type_icon = "🖼️"
-            elif mime_type.startswith('audio/'):
-                type_icon = "🎵"
-            else:
-                type_icon = "📄"
-
-            table.add_row(
-                str(file['id']),
-                file['filename'],
-                size_str,
-                f"{type_icon} {mime_type}",
-                upload_date,
-                file['description'] or ""
-            )
+            files = itertools.chain((first,), files)
+            count = _render_table(files) if interactive else _write_tsv(files)
 
-        console.print(table)
-        total_count = result.get('count', len(files))
-        console.print(f"[green]✅ Found {len(files)} files (total: {total_count})[/green]")
+        if interactive:
+            console.print(f"[green]✅ Found {count} files[/green]")
 
     except httpx.TimeoutException:
         console.print("[red]❌ Request timeout - server may be slow or unreachable[/red]")
@@ -97,7 +129,7 @@ def list_files(
         if e.response.status_code == 404:
             console.print("[red]❌ Files API not found - server may not support file listing[/red]")
         else:
-            console.print(f"[red]❌ Server error: {e.response.status_code} {e.response.text}[/red]")
+            console.print(f"[red]❌ Server error: {e.response.status_code} {response_snippet(e.response)}[/red]")
         raise typer.Exit(1)
     except Exception as e:
         console.print(f"[red]❌ Failed to list files: {str(e)}[/red]")
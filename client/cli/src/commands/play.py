@@ -1,15 +1,66 @@
 # Play command - stream video files to VLC/mpv
 
 import os
+import json
+import hashlib
 import typer
 import subprocess
 import shutil
-import requests
+from functools import lru_cache
 from typing import Optional
 from rich.console import Console
 
 console = Console()
 
+# Players looked up on PATH, in order of preference ("cvlc" is VLC's command-line build on Linux)
+PLAYER_COMMANDS = ("vlc", "mpv", "cvlc")
+
+# Windows VLC installs reachable from WSL
+WSL_PLAYER_PATHS = (
+    "/mnt/c/Program Files/VideoLAN/VLC/vlc.exe",
+    "/mnt/c/Program Files (x86)/VideoLAN/VLC/vlc.exe",
+)
+
+# Last detected player, reused while PATH is unchanged (PATH scans are slow on WSL)
+PLAYER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "nebula", "player.json")
+
+
+def _path_exists(path: str) -> bool:
+    """Single lstat() probe, cheaper than os.path.exists on /mnt/c/"""
+    try:
+        os.stat(path, follow_symlinks=False)
+        return True
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=1)
+def _detect_player() -> Optional[str]:
+    """Return the full path of the first available media player, or None."""
+    path_key = hashlib.sha256(os.environ.get("PATH", "").encode()).hexdigest()
+    try:
+        with open(PLAYER_CACHE_FILE) as f:
+            cached = json.load(f)
+        if cached["path_key"] == path_key and _path_exists(cached["player"]):
+            return cached["player"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    player = next((found for found in map(shutil.which, PLAYER_COMMANDS) if found), None)
+    if player is None:
+        player = next((path for path in WSL_PLAYER_PATHS if _path_exists(path)), None)
+    if player is None:
+        # Not cached, so a newly installed player is picked up next time
+        return None
+
+    try:
+        os.makedirs(os.path.dirname(PLAYER_CACHE_FILE), exist_ok=True)
+        with open(PLAYER_CACHE_FILE, "w") as f:
+            json.dump({"path_key": path_key, "player": player}, f)
+    except OSError:
+        pass
+    return player
+
 
 def play_file(
     file_id: int,
@@ -34,12 +85,14 @@ def play_file(
     stream_url = f"{server_url}/api/files/{file_id}/stream"
     
     if quality:
+        # Only this check needs HTTP; plain playback just hands the URL to the player
+        from ..http_client import get_client, response_json
         console.print(f"[dim]Checking for {quality}p transcoded version...[/dim]")
         try:
             # Check transcoding status
-            response = requests.get(f"{server_url}/api/transcode/{file_id}", timeout=5)
+            response = get_client().get(f"{server_url}/api/transcode/{file_id}", timeout=5.0)
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 available = data.get("available_qualities", [])
                 
                 if quality in available:
@@ -65,18 +118,8 @@ def play_file(
         player_cmd = player
     else:
         # Try to find a media player
-        if shutil.which("vlc"):
-            player_cmd = "vlc"
-        elif shutil.which("mpv"):
-            player_cmd = "mpv"
-        elif shutil.which("cvlc"):  # VLC command-line on Linux
-            player_cmd = "cvlc"
-        elif os.path.exists("/mnt/c/Program Files/VideoLAN/VLC/vlc.exe"):
-            # Windows VLC via WSL
-            player_cmd = "/mnt/c/Program Files/VideoLAN/VLC/vlc.exe"
-        elif os.path.exists("/mnt/c/Program Files (x86)/VideoLAN/VLC/vlc.exe"):
-            player_cmd = "/mnt/c/Program Files (x86)/VideoLAN/VLC/vlc.exe"
-        else:
+        player_cmd = _detect_player()
+        if player_cmd is None:
             console.print("[red]No media player found![/red]")
             console.print("[yellow]Install VLC or mpv, or specify with --player[/yellow]")
             console.print(f"\n[dim]Manual playback: Open this URL in your browser or player:[/dim]")
@@ -86,11 +129,16 @@ def play_file(
     console.print(f"[green]Opening in {player_cmd}...[/green]")
     
     try:
-        # Launch the media player with the stream URL
+        # Launch the media player with the stream URL, in its own session so
+        # Ctrl+C in this terminal doesn't reach it and it outlives the CLI.
+        # Without preexec_fn, CPython starts it with vfork+exec, so nothing of
+        # this process's memory is copied
         subprocess.Popen(
             [player_cmd, stream_url],
+            stdin=subprocess.DEVNULL,
             stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
         )
         
         console.print(f"[green]Player launched! Streaming file ID {file_id}[/green]")
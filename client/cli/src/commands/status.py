@@ -9,17 +9,71 @@ from rich.table import Table
 from rich.text import Text
 import platform
 import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
+from ..http_client import get_client, response_json
+from ..utils.format import format_bytes
 
 console = Console()
 
+# CPU usage is measured against the CPU times saved by the previous run, if it
+# was recent enough; otherwise two samples are taken this far apart (seconds)
+CPU_SAMPLE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "nebula", "cpu.json")
+CPU_SAMPLE_MAX_AGE = 60.0
+CPU_SAMPLE_INTERVAL = 0.1
+
+def _cpu_busy_total(times: dict):
+    """Busy and total CPU seconds from a psutil.cpu_times() dict"""
+    # guest time is already counted in user/nice on Linux
+    total = sum(times.values()) - times.get('guest', 0) - times.get('guest_nice', 0)
+    idle = times.get('idle', 0) + times.get('iowait', 0)
+    return total - idle, total
+
+def get_cpu_percent():
+    """System-wide CPU usage without sleeping a full second for the delta"""
+    now = time.time()
+    current = psutil.cpu_times()._asdict()
+    previous = None
+    try:
+        with open(CPU_SAMPLE_FILE) as f:
+            saved = json.load(f)
+        if 0 < now - saved['time'] <= CPU_SAMPLE_MAX_AGE:
+            previous = saved['times']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    if previous is not None:
+        busy_before, total_before = _cpu_busy_total(previous)
+        busy_after, total_after = _cpu_busy_total(current)
+    if previous is None or total_after <= total_before:
+        # No usable sample from an earlier run: take a short one now
+        busy_before, total_before = _cpu_busy_total(current)
+        time.sleep(CPU_SAMPLE_INTERVAL)
+        now = time.time()
+        current = psutil.cpu_times()._asdict()
+        busy_after, total_after = _cpu_busy_total(current)
+
+    try:
+        os.makedirs(os.path.dirname(CPU_SAMPLE_FILE), exist_ok=True)
+        with open(CPU_SAMPLE_FILE, 'w') as f:
+            json.dump({'time': now, 'times': current}, f)
+    except OSError:
+        pass
+
+    total_delta = total_after - total_before
+    if total_delta <= 0:
+        return 0.0
+    return min(100.0, max(0.0, 100.0 * (busy_after - busy_before) / total_delta))
+
 def get_system_specs():
     """Get local system specifications"""
     try:
         # CPU info
         cpu_count = psutil.cpu_count()
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = get_cpu_percent()
 
         # Memory info
         memory = psutil.virtual_memory()
@@ -61,16 +115,11 @@ def get_system_specs():
     except Exception as e:
         return {"error": f"Failed to get system specs: {str(e)}"}
 
-def format_bytes(bytes_value):
-    """Format bytes to human readable format"""
-    if bytes_value < 1024:
-        return f"{bytes_value} B"
-    elif bytes_value < 1024 * 1024:
-        return f"{bytes_value / 1024:.1f} KB"
-    elif bytes_value < 1024 * 1024 * 1024:
-        return f"{bytes_value / (1024 * 1024):.1f} MB"
-    else:
-        return f"{bytes_value / (1024 * 1024 * 1024):.1f} GB"
+def fetch_server_health(server_url: str):
+    """Fetch the server's /health report"""
+    response = get_client().get(f"{server_url}/health", timeout=10.0)
+    response.raise_for_status()
+    return response_json(response)
 
 def show_system_health(
     server_url: Optional[str] = None,
@@ -93,6 +142,12 @@ def show_system_health(
     console.print(f"[dim]Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}[/dim]")
     console.print()
 
+    # Start the server probe first: local CPU sampling may block briefly,
+    # and the request can be in flight meanwhile
+    executor = ThreadPoolExecutor(max_workers=1)
+    health_future = executor.submit(fetch_server_health, server_url) if show_server else None
+    executor.shutdown(wait=False)
+
     # Local System Specs
     if show_local:
         console.print("[bold green]💻 Local System[/bold green]")
@@ -134,10 +189,7 @@ def show_system_health(
         console.print(f"[bold cyan]☁️  Server Health ({server_url})[/bold cyan]")
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(f"{server_url}/health")
-                response.raise_for_status()
-                health_data = response.json()
+            health_data = health_future.result()
 
             # Server Status Table
             server_table = Table(title="🚀 Server Status", show_header=False, box=None)
@@ -1,87 +1,131 @@
 # System commands - logs, restart, container status
 
-import os
 import requests
-from rich.console import Console
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich.syntax import Syntax
 from typing import Optional
+from ..http_client import response_json, with_session
 
 console = Console()
-SERVER_URL = os.getenv("NEBULA_SERVER_URL")
 
 VALID_SERVICES = ["api", "worker", "db", "s3", "queue"]
 
 
-def show_logs(service: Optional[str] = None, lines: int = 100, server_url: Optional[str] = None):
+def _print_plain_logs(title: Optional[str], logs: str):
+    """Write logs as-is for pipes: no panel drawing, markup or highlighting."""
+    if title:
+        console.out(f"==> {title} <==", highlight=False)
+    if logs:
+        console.out(logs, highlight=False)
+
+
+@with_session
+def show_logs(session, service: Optional[str] = None, lines: int = 100, parallel: bool = False, server_url: Optional[str] = None):
     """
     Show logs for a service or all services.
     
     Args:
         service: Service name (api, worker, db, s3, queue) or None for all
         lines: Number of log lines to fetch
+        parallel: For all services, fetch each service's logs concurrently
         server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    server_url = server_url or SERVER_URL
-    if not server_url:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
-    try:
-        if service:
-            # Single service logs
-            if service not in VALID_SERVICES:
-                console.print(f"[red]Invalid service: {service}[/red]")
-                console.print(f"[dim]Valid services: {', '.join(VALID_SERVICES)}[/dim]")
+    # Panels only on a terminal; piped output (e.g. into grep) gets the raw lines
+    interactive = console.is_terminal
+
+    if service:
+        # Single service logs
+        if service not in VALID_SERVICES:
+            console.print(f"[red]Invalid service: {service}[/red]")
+            console.print(f"[dim]Valid services: {', '.join(VALID_SERVICES)}[/dim]")
+            return
+        
+        console.print(f"[cyan]Fetching logs for {service}...[/cyan]")
+        response = session.get(
+            f"{server_url}/api/system/logs/{service}",
+            params={"lines": lines},
+            timeout=30
+        )
+        
+        if response.status_code == 200:
+            data = response_json(response)
+            if not interactive:
+                _print_plain_logs(None, data["logs"])
                 return
-            
-            console.print(f"[cyan]Fetching logs for {service}...[/cyan]")
-            response = requests.get(
-                f"{server_url}/api/system/logs/{service}",
-                params={"lines": lines},
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                console.print(Panel(
-                    data["logs"] if data["logs"] else "[dim]No logs available[/dim]",
-                    title=f"[bold]{service}[/bold] ({data['container']}) - Last {lines} lines",
-                    border_style="blue"
-                ))
-            else:
-                console.print(f"[red]Error: {response.json().get('detail', 'Unknown error')}[/red]")
+            console.print(Panel(
+                data["logs"] if data["logs"] else "[dim]No logs available[/dim]",
+                title=f"[bold]{service}[/bold] ({data['container']}) - Last {lines} lines",
+                border_style="blue"
+            ))
         else:
-            # All services logs
-            console.print(f"[cyan]Fetching logs for all services...[/cyan]")
-            response = requests.get(
-                f"{server_url}/api/system/logs",
+            console.print(f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]")
+    elif parallel:
+        # One request per service on the pooled session, so the wait is the
+        # slowest service rather than the sum; panels appear as they arrive
+        console.print(f"[cyan]Fetching logs for all services in parallel...[/cyan]")
+
+        def fetch(svc: str):
+            return session.get(
+                f"{server_url}/api/system/logs/{svc}",
                 params={"lines": min(lines, 50)},  # Limit per service when fetching all
-                timeout=60
+                timeout=30
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                for svc, logs in data["logs"].items():
-                    console.print(Panel(
-                        logs if logs else "[dim]No logs available[/dim]",
-                        title=f"[bold]{svc}[/bold]",
-                        border_style="blue"
-                    ))
-                    console.print()
-            else:
-                console.print(f"[red]Error: {response.json().get('detail', 'Unknown error')}[/red]")
 
-    except requests.exceptions.Timeout:
-        console.print("[red]Error: Request timed out[/red]")
-    except requests.exceptions.ConnectionError:
-        console.print(f"[red]Error: Cannot connect to server at {server_url}[/red]")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        with ThreadPoolExecutor(max_workers=len(VALID_SERVICES)) as executor:
+            futures = {executor.submit(fetch, svc): svc for svc in VALID_SERVICES}
+            for future in as_completed(futures):
+                svc = futures[future]
+                try:
+                    response = future.result()
+                    if response.status_code == 200:
+                        data = response_json(response)
+                        if not interactive:
+                            _print_plain_logs(svc, data["logs"])
+                            continue
+                        body = data["logs"] if data["logs"] else "[dim]No logs available[/dim]"
+                        title = f"[bold]{svc}[/bold] ({data['container']})"
+                    else:
+                        body = f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]"
+                        title = f"[bold]{svc}[/bold]"
+                except Exception as e:
+                    body = f"[red]Error: {e}[/red]"
+                    title = f"[bold]{svc}[/bold]"
+                console.print(Panel(body, title=title, border_style="blue", padding=(1, 1)))
+    else:
+        # All services logs
+        console.print(f"[cyan]Fetching logs for all services...[/cyan]")
+        response = session.get(
+            f"{server_url}/api/system/logs",
+            params={"lines": min(lines, 50)},  # Limit per service when fetching all
+            timeout=60
+        )
+        
+        if response.status_code == 200:
+            data = response_json(response)
+            if not interactive:
+                for svc, logs in data["logs"].items():
+                    _print_plain_logs(svc, logs)
+                return
+            # Rendered and written in one go rather than a print per service
+            panels = [
+                Panel(
+                    logs if logs else "[dim]No logs available[/dim]",
+                    title=f"[bold]{svc}[/bold]",
+                    border_style="blue",
+                    padding=(1, 1)
+                )
+                for svc, logs in data["logs"].items()
+            ]
+            console.print(Group(*panels))
+        else:
+            console.print(f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]")
 
 
-def restart_service(service: Optional[str] = None, force: bool = False, server_url: Optional[str] = None):
+@with_session
+def restart_service(session, service: Optional[str] = None, force: bool = False, server_url: Optional[str] = None):
     """
     Restart a service or all services.
     
@@ -90,11 +134,6 @@ def restart_service(service: Optional[str] = None, force: bool = False, server_u
         force: Skip confirmation prompt
         server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    server_url = server_url or SERVER_URL
-    if not server_url:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
     try:
         if service:
             # Single service restart
@@ -110,16 +149,16 @@ def restart_service(service: Optional[str] = None, force: bool = False, server_u
                 console.print("[yellow]Warning: Restarting database may cause data loss if transactions are in progress![/yellow]")
             
             console.print(f"[cyan]Restarting {service}...[/cyan]")
-            response = requests.post(
+            response = session.post(
                 f"{server_url}/api/system/restart/{service}",
                 timeout=120
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 console.print(f"[green]{data['message']}[/green]")
             else:
-                console.print(f"[red]Error: {response.json().get('detail', 'Unknown error')}[/red]")
+                console.print(f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]")
         else:
             # All services restart
             if not force:
@@ -128,13 +167,13 @@ def restart_service(service: Optional[str] = None, force: bool = False, server_u
                 return
             
             console.print("[cyan]Restarting all services...[/cyan]")
-            response = requests.post(
+            response = session.post(
                 f"{server_url}/api/system/restart",
                 timeout=300
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
                 
                 table = Table(title="Restart Results")
                 table.add_column("Service", style="cyan")
@@ -151,73 +190,52 @@ def restart_service(service: Optional[str] = None, force: bool = False, server_u
                 else:
                     console.print("[green]All services restarted successfully![/green]")
             else:
-                console.print(f"[red]Error: {response.json().get('detail', 'Unknown error')}[/red]")
+                console.print(f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]")
 
     except requests.exceptions.Timeout:
         console.print("[yellow]Request timed out - service may still be restarting[/yellow]")
     except requests.exceptions.ConnectionError:
-        if service == "api":
-            console.print("[yellow]Connection lost - API is restarting. Wait a few seconds and try 'nebula ping'[/yellow]")
-        else:
-            console.print(f"[red]Error: Cannot connect to server at {SERVER_URL}[/red]")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+        if service != "api":
+            raise
+        console.print("[yellow]Connection lost - API is restarting. Wait a few seconds and try 'nebula ping'[/yellow]")
 
 
-def show_container_status(server_url: Optional[str] = None):
+@with_session
+def show_container_status(session, server_url: Optional[str] = None):
     """
     Show status of all Docker containers.
     
     Args:
         server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    server_url = server_url or SERVER_URL
-    if not server_url:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
-    try:
-        console.print("[cyan]Checking container status...[/cyan]")
-        response = requests.get(
-            f"{server_url}/api/system/status",
-            timeout=15
-        )
+    console.print("[cyan]Checking container status...[/cyan]")
+    response = session.get(
+        f"{server_url}/api/system/status",
+        timeout=15
+    )
+    
+    if response.status_code == 200:
+        data = response_json(response)
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            overall = data["overall"]
-            overall_style = "green" if overall == "healthy" else "yellow"
-            
-            table = Table(title=f"Nebula Services [{overall_style}]{overall.upper()}[/{overall_style}]")
-            table.add_column("Service", style="cyan")
-            table.add_column("Container", style="dim")
-            table.add_column("Status", style="bold")
-            
-            for svc, info in data["services"].items():
-                status = info["status"]
-                if status == "running":
-                    status_style = "[green]running[/green]"
-                elif status == "exited":
-                    status_style = "[red]exited[/red]"
-                else:
-                    status_style = f"[yellow]{status}[/yellow]"
-                
-                table.add_row(svc, info["container"], status_style)
+        overall = data["overall"]
+        overall_style = "green" if overall == "healthy" else "yellow"
+        
+        table = Table(title=f"Nebula Services [{overall_style}]{overall.upper()}[/{overall_style}]")
+        table.add_column("Service", style="cyan")
+        table.add_column("Container", style="dim")
+        table.add_column("Status", style="bold")
+        
+        for svc, info in data["services"].items():
+            status = info["status"]
+            if status == "running":
+                status_style = "[green]running[/green]"
+            elif status == "exited":
+                status_style = "[red]exited[/red]"
+            else:
+                status_style = f"[yellow]{status}[/yellow]"
             
-            console.print(table)
-        else:
-            console.print(f"[red]Error: {response.json().get('detail', 'Unknown error')}[/red]")
-
-    except requests.exceptions.Timeout:
-        console.print("[red]Error: Request timed out[/red]")
-    except requests.exceptions.ConnectionError:
-        console.print(f"[red]Error: Cannot connect to server at {server_url}[/red]")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-
-
-
-
-
-
+            table.add_row(svc, info["container"], status_style)
+        
+        console.print(table)
+    else:
+        console.print(f"[red]Error: {response_json(response).get('detail', 'Unknown error')}[/red]")
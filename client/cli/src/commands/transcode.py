@@ -1,120 +1,140 @@
 # Transcode command - trigger video transcoding and check status
 
-import os
 import requests
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from rich.panel import Panel
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import random
 import time
+from ..http_client import response_json, response_snippet, with_session
+from ..utils.format import format_bytes
 
 console = Console()
-SERVER_URL = os.getenv("NEBULA_SERVER_URL")
 
-
-def transcode_file(file_id: int, qualities: Optional[List[int]] = None):
+# --watch polling: back off from the shortest to the longest interval (seconds)
+# while nothing advances, and return to the shortest as soon as progress moves
+WATCH_MIN_INTERVAL = 2.0
+WATCH_MAX_INTERVAL = 30.0
+# Each wait is randomised by this fraction so several watchers don't poll in step
+WATCH_JITTER = 0.1
+
+# Rich markup per job status; anything else is shown dimmed
+_STATUS_STYLE = {
+    "completed": "[green]completed[/green]",
+    "processing": "[yellow]processing[/yellow]",
+    "pending": "[blue]pending[/blue]",
+    "failed": "[red]failed[/red]",
+}
+# Statuses that keep --watch polling
+_ACTIVE_STATUSES = frozenset({"processing", "pending"})
+
+# Transcode API endpoints, relative to the server URL
+_TRANSCODE_PATH = "/api/transcode"
+_TRANSCODE_FILE_PATH = _TRANSCODE_PATH + "/{}"
+_TRANSCODE_JOBS_PATH = _TRANSCODE_PATH + "/jobs/all"
+_TRANSCODE_JOB_PATH = _TRANSCODE_PATH + "/job/{}"
+
+
+@with_session
+def transcode_file(session, file_id: int, qualities: Optional[List[int]] = None, server_url: Optional[str] = None):
     """
     Trigger transcoding for a video file
 
     Args:
         file_id: ID of the file to transcode
         qualities: List of target qualities (480, 720, 1080). Defaults to [480, 720]
+        server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    if not SERVER_URL:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
     if qualities is None:
         qualities = [480, 720]
 
     console.print(f"[cyan]Requesting transcoding for file {file_id}...[/cyan]")
     console.print(f"[dim]Target qualities: {', '.join([f'{q}p' for q in qualities])}[/dim]")
 
-    try:
-        response = requests.post(
-            f"{SERVER_URL}/api/transcode",
-            json={"file_id": file_id, "qualities": qualities},
-            timeout=30
-        )
+    response = session.post(
+        server_url.rstrip("/") + _TRANSCODE_PATH,
+        json={"file_id": file_id, "qualities": qualities},
+        timeout=30
+    )
 
-        if response.status_code == 200:
-            data = response.json()
+    if response.status_code == 200:
+        data = response_json(response)
 
-            if "jobs" in data and data["jobs"]:
-                console.print(f"\n[green]Transcoding started![/green]")
-                console.print(f"[dim]{data.get('message', '')}[/dim]\n")
+        if "jobs" in data and data["jobs"]:
+            console.print(f"\n[green]Transcoding started![/green]")
+            console.print(f"[dim]{data.get('message', '')}[/dim]\n")
 
-                table = Table(title="Queued Jobs")
-                table.add_column("Job ID", style="cyan")
-                table.add_column("Quality", style="magenta")
-                table.add_column("Status", style="yellow")
+            table = Table(title="Queued Jobs")
+            table.add_column("Job ID", style="cyan")
+            table.add_column("Quality", style="magenta")
+            table.add_column("Status", style="yellow")
 
-                for job in data["jobs"]:
-                    table.add_row(
-                        str(job["job_id"]),
-                        f"{job['quality']}p",
-                        job["status"]
-                    )
+            for job in data["jobs"]:
+                table.add_row(
+                    str(job["job_id"]),
+                    f"{job['quality']}p",
+                    job["status"]
+                )
 
-                console.print(table)
-                console.print(f"\n[dim]Use 'nebula transcode-status {file_id}' to check progress[/dim]")
-            else:
-                console.print(f"\n[yellow]{data.get('message', 'No jobs created')}[/yellow]")
-                if data.get("transcoded_qualities"):
-                    console.print(f"[dim]Already transcoded: {', '.join([f'{q}p' for q in data['transcoded_qualities']])}[/dim]")
-
-        elif response.status_code == 404:
-            console.print(f"[red]Error: File {file_id} not found[/red]")
-        elif response.status_code == 400:
-            error = response.json().get("detail", "Bad request")
-            console.print(f"[red]Error: {error}[/red]")
+            console.print(table)
+            console.print(f"\n[dim]Use 'nebula transcode-status {file_id}' to check progress[/dim]")
         else:
-            console.print(f"[red]Error: Server returned {response.status_code}[/red]")
-            console.print(f"[dim]{response.text}[/dim]")
-
-    except requests.exceptions.Timeout:
-        console.print("[red]Error: Request timed out[/red]")
-    except requests.exceptions.ConnectionError:
-        console.print(f"[red]Error: Cannot connect to server at {SERVER_URL}[/red]")
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+            console.print(f"\n[yellow]{data.get('message', 'No jobs created')}[/yellow]")
+            if data.get("transcoded_qualities"):
+                console.print(f"[dim]Already transcoded: {', '.join([f'{q}p' for q in data['transcoded_qualities']])}[/dim]")
+
+    elif response.status_code == 404:
+        console.print(f"[red]Error: File {file_id} not found[/red]")
+    elif response.status_code == 400:
+        error = response_json(response).get("detail", "Bad request")
+        console.print(f"[red]Error: {error}[/red]")
+    else:
+        console.print(f"[red]Error: Server returned {response.status_code}[/red]")
+        console.print(f"[dim]{response_snippet(response)}[/dim]")
 
 
-def get_transcode_status(file_id: int, watch: bool = False):
+@with_session
+def get_transcode_status(session, file_id: int, watch: bool = False, server_url: Optional[str] = None):
     """
     Get transcoding status for a file
 
     Args:
         file_id: ID of the file to check
         watch: If True, continuously poll for updates
+        server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    if not SERVER_URL:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
-    def fetch_and_display():
+    # The URL is built once rather than per poll
+    status_url = server_url.rstrip("/") + _TRANSCODE_FILE_PATH.format(file_id)
+
+    def fetch_status() -> Tuple[RenderableType, Optional[bool], float]:
+        """
+        Build the file's status view. Returns (view, has_active_jobs, progress_sum);
+        has_active_jobs is None when the server couldn't be reached.
+        """
         try:
-            response = requests.get(
-                f"{SERVER_URL}/api/transcode/{file_id}",
+            response = session.get(
+                status_url,
                 timeout=10
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = response_json(response)
 
                 # File info panel
                 file_info = f"""
 [bold]{data['filename']}[/bold]
-Original size: {format_size(data['original_size'])}
+Original size: {format_bytes(data['original_size']) if data['original_size'] is not None else '-'}
 Is video: {'Yes' if data['is_video'] else 'No'}
 Available qualities: {', '.join([f"{q}p" for q in data['available_qualities']]) if data['available_qualities'] else 'None'}
                 """.strip()
-                console.print(Panel(file_info, title=f"File #{file_id}"))
+                info_panel = Panel(file_info, title=f"File #{file_id}")
 
                 if not data["jobs"]:
-                    console.print("[dim]No transcoding jobs found for this file[/dim]")
-                    return False  # No active jobs
+                    no_jobs = "[dim]No transcoding jobs found for this file[/dim]"
+                    return Group(info_panel, no_jobs), False, 0.0  # No active jobs
 
                 # Jobs table
                 table = Table(title="Transcoding Jobs")
@@ -126,24 +146,16 @@ Available qualities: {', '.join([f"{q}p" for q in data['available_qualities']])
                 table.add_column("Error", style="red")
 
                 has_active_jobs = False
+                progress_sum = 0.0
                 for job in data["jobs"]:
                     status = job["status"]
-                    if status == "completed":
-                        status_style = "[green]completed[/green]"
-                    elif status == "processing":
-                        status_style = "[yellow]processing[/yellow]"
-                        has_active_jobs = True
-                    elif status == "pending":
-                        status_style = "[blue]pending[/blue]"
-                        has_active_jobs = True
-                    elif status == "failed":
-                        status_style = "[red]failed[/red]"
-                    else:
-                        status_style = f"[dim]{status}[/dim]"
+                    status_style = _STATUS_STYLE.get(status) or f"[dim]{status}[/dim]"
+                    has_active_jobs |= status in _ACTIVE_STATUSES
 
+                    progress_sum += job['progress'] or 0.0
                     progress = f"{job['progress']:.1f}%" if job['progress'] else "0%"
-                    output_size = format_size(job['output_size']) if job['output_size'] else "-"
-                    error = (job['error_message'][:30] + "...") if job.get('error_message') and len(job['error_message']) > 30 else (job.get('error_message') or "-")
+                    output_size = format_bytes(job['output_size']) if job['output_size'] else "-"
+                    error = _truncate(job.get('error_message') or "-", 30)
 
                     table.add_row(
                         str(job["id"]),
@@ -154,158 +166,134 @@ Available qualities: {', '.join([f"{q}p" for q in data['available_qualities']])
                         error
                     )
 
-                console.print(table)
-                return has_active_jobs
+                return Group(info_panel, table), has_active_jobs, progress_sum
 
             elif response.status_code == 404:
-                console.print(f"[red]Error: File {file_id} not found[/red]")
-                return False
+                return f"[red]Error: File {file_id} not found[/red]", False, 0.0
             else:
-                console.print(f"[red]Error: Server returned {response.status_code}[/red]")
-                return False
+                return f"[red]Error: Server returned {response.status_code}[/red]", False, 0.0
 
         except requests.exceptions.Timeout:
-            console.print("[red]Error: Request timed out[/red]")
-            return False
+            return "[red]Error: Request timed out[/red]", None, 0.0
         except requests.exceptions.ConnectionError:
-            console.print(f"[red]Error: Cannot connect to server at {SERVER_URL}[/red]")
-            return False
+            return f"[red]Error: Cannot connect to server at {server_url}[/red]", None, 0.0
         except Exception as e:
-            console.print(f"[red]Error: {e}[/red]")
-            return False
+            return f"[red]Error: {e}[/red]", False, 0.0
 
     if watch:
         console.print("[dim]Watching for updates... Press Ctrl+C to stop[/dim]\n")
+        interval = WATCH_MIN_INTERVAL
+        prev_progress_sum = None
+        # Redrawn in place on each poll, rather than clearing the screen and
+        # printing everything again; nothing changes between polls, so no
+        # background refresh either
+        live = Live(console=console, auto_refresh=False)
         try:
-            while True:
-                console.clear()
-                has_active = fetch_and_display()
-                if not has_active:
-                    console.print("\n[green]All jobs completed![/green]")
-                    break
-                console.print("\n[dim]Refreshing in 5 seconds...[/dim]")
-                time.sleep(5)
+            with live:
+                while True:
+                    view, has_active, progress_sum = fetch_status()
+                    if has_active is False:
+                        live.update(Group(view, "\n[green]All jobs completed![/green]"), refresh=True)
+                        break
+                    # Poll quickly while jobs advance; back off while they sit
+                    # pending or the server is unreachable
+                    if has_active and prev_progress_sum is not None and progress_sum > prev_progress_sum:
+                        interval = WATCH_MIN_INTERVAL
+                    elif prev_progress_sum is not None or has_active is None:
+                        interval = min(interval * 2, WATCH_MAX_INTERVAL)
+                    if has_active:
+                        prev_progress_sum = progress_sum
+                    delay = interval * random.uniform(1 - WATCH_JITTER, 1 + WATCH_JITTER)
+                    live.update(Group(view, f"\n[dim]Refreshing in {delay:.0f} seconds...[/dim]"), refresh=True)
+                    time.sleep(delay)
         except KeyboardInterrupt:
             console.print("\n[dim]Stopped watching[/dim]")
     else:
-        fetch_and_display()
+        console.print(fetch_status()[0])
 
 
-def list_transcode_jobs(status: Optional[str] = None, limit: int = 20):
+@with_session
+def list_transcode_jobs(session, status: Optional[str] = None, limit: int = 20, server_url: Optional[str] = None):
     """
     List all transcoding jobs
 
     Args:
         status: Filter by status (pending, processing, completed, failed)
         limit: Maximum number of jobs to display
+        server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    if not SERVER_URL:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
-    try:
-        params = {"limit": limit}
-        if status:
-            params["status"] = status
-
-        response = requests.get(
-            f"{SERVER_URL}/api/transcode/jobs/all",
-            params=params,
-            timeout=10
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-
-            if not data["jobs"]:
-                console.print("[dim]No transcoding jobs found[/dim]")
-                return
-
-            table = Table(title=f"Transcoding Jobs ({data['total']} total)")
-            table.add_column("Job ID", style="cyan")
-            table.add_column("File ID", style="dim")
-            table.add_column("Filename")
-            table.add_column("Quality", style="magenta")
-            table.add_column("Status", style="bold")
-            table.add_column("Progress", justify="right")
-
-            for job in data["jobs"]:
-                status_val = job["status"]
-                if status_val == "completed":
-                    status_style = "[green]completed[/green]"
-                elif status_val == "processing":
-                    status_style = "[yellow]processing[/yellow]"
-                elif status_val == "pending":
-                    status_style = "[blue]pending[/blue]"
-                elif status_val == "failed":
-                    status_style = "[red]failed[/red]"
-                else:
-                    status_style = f"[dim]{status_val}[/dim]"
-
-                progress = f"{job['progress']:.1f}%" if job.get('progress') else "0%"
-                filename = job['filename'][:25] + "..." if len(job['filename']) > 25 else job['filename']
-
-                table.add_row(
-                    str(job["job_id"]),
-                    str(job["file_id"]),
-                    filename,
-                    f"{job['target_quality']}p",
-                    status_style,
-                    progress
-                )
-
-            console.print(table)
+    params = {"limit": limit}
+    if status:
+        params["status"] = status
+
+    response = session.get(
+        server_url.rstrip("/") + _TRANSCODE_JOBS_PATH,
+        params=params,
+        timeout=10
+    )
+
+    if response.status_code == 200:
+        data = response_json(response)
+
+        if not data["jobs"]:
+            console.print("[dim]No transcoding jobs found[/dim]")
+            return
+
+        table = Table(title=f"Transcoding Jobs ({data['total']} total)")
+        table.add_column("Job ID", style="cyan")
+        table.add_column("File ID", style="dim")
+        table.add_column("Filename")
+        table.add_column("Quality", style="magenta")
+        table.add_column("Status", style="bold")
+        table.add_column("Progress", justify="right")
+
+        for job in data["jobs"]:
+            status_val = job["status"]
+            status_style = _STATUS_STYLE.get(status_val) or f"[dim]{status_val}[/dim]"
+
+            progress = f"{job['progress']:.1f}%" if job.get('progress') else "0%"
+            filename = _truncate(job['filename'], 25)
+
+            table.add_row(
+                str(job["job_id"]),
+                str(job["file_id"]),
+                filename,
+                f"{job['target_quality']}p",
+                status_style,
+                progress
+            )
 
-        else:
-            console.print(f"[red]Error: Server returned {response.status_code}[/red]")
+        console.print(table)
 
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
+    else:
+        console.print(f"[red]Error: Server returned {response.status_code}[/red]")
 
 
-def cancel_transcode_job(job_id: int):
+@with_session
+def cancel_transcode_job(session, job_id: int, server_url: Optional[str] = None):
     """
     Cancel a transcoding job
 
     Args:
         job_id: ID of the job to cancel
+        server_url: Server URL (defaults to NEBULA_SERVER_URL env var)
     """
-    if not SERVER_URL:
-        console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
-        return
-
-    try:
-        response = requests.delete(
-            f"{SERVER_URL}/api/transcode/job/{job_id}",
-            timeout=10
-        )
-
-        if response.status_code == 200:
-            console.print(f"[green]Job {job_id} cancelled successfully[/green]")
-        elif response.status_code == 404:
-            console.print(f"[red]Error: Job {job_id} not found[/red]")
-        elif response.status_code == 400:
-            error = response.json().get("detail", "Cannot cancel job")
-            console.print(f"[yellow]{error}[/yellow]")
-        else:
-            console.print(f"[red]Error: Server returned {response.status_code}[/red]")
-
-    except Exception as e:
-        console.print(f"[red]Error: {e}[/red]")
-
-
-def format_size(size_bytes: int) -> str:
-    """Format bytes to human readable size"""
-    if size_bytes is None:
-        return "-"
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
-
-
-
-
+    response = session.delete(
+        server_url.rstrip("/") + _TRANSCODE_JOB_PATH.format(job_id),
+        timeout=10
+    )
+
+    if response.status_code == 200:
+        console.print(f"[green]Job {job_id} cancelled successfully[/green]")
+    elif response.status_code == 404:
+        console.print(f"[red]Error: Job {job_id} not found[/red]")
+    elif response.status_code == 400:
+        error = response_json(response).get("detail", "Cannot cancel job")
+        console.print(f"[yellow]{error}[/yellow]")
+    else:
+        console.print(f"[red]Error: Server returned {response.status_code}[/red]")
 
 
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with "..."."""
+    return text if len(text) <= limit else text[:limit] + "..."
@@ -1,54 +1,87 @@
 # Upload command - uploads files to server with progress bar
 
 import os
+import atexit
+import mmap
+import socket
+import stat
 import typer
-import shutil
 import tempfile
+import threading
+import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Generator
+from typing import Iterator, Optional, Generator, Tuple
 import mimetypes
 import httpx
 from rich.console import Console
+from rich.text import Text
 from rich.progress import Progress, BarColumn, TransferSpeedColumn, TimeRemainingColumn, TaskProgressColumn
+from ..http_client import http2_supported, response_json
 
 console = Console()
 
-
-class ProgressFileReader:
+# Socket send buffer for streamed uploads
+UPLOAD_SNDBUF_BYTES = 4 * 1024 * 1024
+
+# Bytes sent between progress bar updates; repainting the bar for every
+# chunk costs more than sending it
+PROGRESS_UPDATE_BYTES = 4 * 1024 * 1024
+
+# Slice of the memory-mapped file handed to the socket per write
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# Direct (presigned) uploads at least this large are sent as S3 multipart
+# parts over parallel connections, so one TCP stream doesn't cap throughput
+MULTIPART_MIN_BYTES = 64 * 1024 * 1024
+# Smallest and largest part size (S3 requires 5 MiB for all but the last
+# part), and the most parts one upload may have
+MULTIPART_PART_BYTES = 8 * 1024 * 1024
+MULTIPART_MAX_PART_BYTES = 256 * 1024 * 1024
+MULTIPART_MAX_PARTS = 10000
+# Parts are sized to take about this long on one connection at the speed
+# measured last time: big enough that per-request overhead doesn't matter,
+# small enough that a retry is cheap
+MULTIPART_PART_SECONDS = 3.0
+# Per-connection upload speed (bytes/s) measured for each server
+UPLOAD_SPEED_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "nebula", "upload_speed.json")
+# Parts uploaded at once, and tries per part before the upload is abandoned
+MULTIPART_JOBS = 8
+MULTIPART_PART_ATTEMPTS = 3
+# Pooled connections: one per concurrent part plus the API server's, all kept
+# alive between parts so each part after the first skips the handshake
+UPLOAD_MAX_CONNECTIONS = 16
+
+_client: Optional[httpx.Client] = None
+
+
+def _get_client() -> httpx.Client:
     """
-    A file-like wrapper that updates a progress bar as data is read.
-    Used for streaming uploads with progress tracking.
+    Return the upload client, creating it on first use.
+
+    Every upload request (presign, data, complete) shares its
+    pooled connections, so uploads in one process (e.g. the benchmark) pay for
+    a single handshake. HTTP/2 is negotiated per origin where the server offers
+    it; object storage that only speaks HTTP/1.1 gets one kept-alive connection
+    per concurrent part from the same pool. A larger send buffer keeps the
+    socket fed on fast links.
     """
-    def __init__(self, file_path: str, progress: Progress, task_id):
-        self.file_path = file_path
-        self.file = open(file_path, 'rb')
-        self.progress = progress
-        self.task_id = task_id
-        self.file_size = os.path.getsize(file_path)
-        self.bytes_read = 0
-    
-    def read(self, size: int = -1) -> bytes:
-        data = self.file.read(size)
-        if data:
-            self.bytes_read += len(data)
-            self.progress.update(self.task_id, completed=self.bytes_read)
-        return data
-    
-    def seek(self, offset: int, whence: int = 0):
-        return self.file.seek(offset, whence)
-    
-    def tell(self) -> int:
-        return self.file.tell()
-    
-    def close(self):
-        self.file.close()
-    
-    def __enter__(self):
-        return self
-    
-    def __exit__(self, *args):
-        self.close()
+    global _client
+    if _client is None:
+        transport = httpx.HTTPTransport(
+            http2=http2_supported(),
+            limits=httpx.Limits(
+                max_keepalive_connections=UPLOAD_MAX_CONNECTIONS,
+                max_connections=UPLOAD_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            ),
+            socket_options=[(socket.SOL_SOCKET, socket.SO_SNDBUF, UPLOAD_SNDBUF_BYTES)]
+        )
+        # Long read/write timeouts for large uploads (10 minutes)
+        _client = httpx.Client(transport=transport, timeout=httpx.Timeout(600.0, connect=30.0))
+        atexit.register(_client.close)
+    return _client
 
 
 def file_chunk_generator(file_path: str, progress: Progress, task_id, chunk_size: int = 1024 * 1024) -> Generator[bytes, None, None]:
@@ -56,25 +89,57 @@ def file_chunk_generator(file_path: str, progress: Progress, task_id, chunk_size
     Generator that yields file chunks and updates progress bar.
     """
     bytes_sent = 0
+    bytes_shown = 0
     with open(file_path, 'rb') as f:
         while True:
             chunk = f.read(chunk_size)
             if not chunk:
                 break
             bytes_sent += len(chunk)
-            progress.update(task_id, completed=bytes_sent)
+            if bytes_sent - bytes_shown >= PROGRESS_UPDATE_BYTES:
+                progress.update(task_id, completed=bytes_sent)
+                bytes_shown = bytes_sent
             yield chunk
+    progress.update(task_id, completed=bytes_sent)
+
+
+def _copy_to_anonymous_temp(file_path: str, file_size: int) -> int:
+    """
+    Copy a file into an unnamed (O_TMPFILE) file in the temp directory and
+    return its descriptor. The copy is freed when the descriptor is closed,
+    so even a crash can't leave it behind. Data moves through sendfile(2).
+    """
+    temp_fd = os.open(tempfile.gettempdir(), os.O_TMPFILE | os.O_RDWR, 0o600)
+    try:
+        with open(file_path, 'rb') as src:
+            offset = 0
+            while offset < file_size:
+                sent = os.sendfile(temp_fd, src.fileno(), offset, file_size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    except BaseException:
+        os.close(temp_fd)
+        raise
+    return temp_fd
 
 
 def upload_file(
     file_path: str,
     server_url: Optional[str] = None,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    json_output: bool = False
 ):
     """
     Upload a file to Nebula Cloud
 
     FILE_PATH: Path to the file to upload
+
+    With json_output, the file's metadata is also printed as a single JSON
+    line at the end, for scripts that would otherwise scrape the output.
+
+    Returns the uploaded file's metadata as reported by the server, so callers
+    running in-process (e.g. the benchmark) get the file ID without parsing output.
     """
     # Load server URL from environment if not provided
     if not server_url:
@@ -83,81 +148,93 @@ def upload_file(
             console.print("[red]❌ Error: NEBULA_SERVER_URL environment variable not set[/red]")
             raise typer.Exit(1)
 
-    # Validate file exists
-    if not os.path.exists(file_path):
+    # One Path for everything below. absolute() only joins the working
+    # directory (no filesystem calls), so relative paths under /mnt/ count too
+    path = Path(file_path).absolute()
+
+    # Validate file exists and is a regular file. A single stat() answers both
+    # checks and the size, which matters on slow mounts like WSL's /mnt/c/
+    try:
+        file_stat = path.stat()
+    except FileNotFoundError:
         console.print(f"[red]❌ File not found: {file_path}[/red]")
         raise typer.Exit(1)
 
-    # Check if it's a file (not directory)
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(file_stat.st_mode):
         console.print(f"[red]❌ Path is not a file: {file_path}[/red]")
         raise typer.Exit(1)
 
-    file_path_obj = Path(file_path)
-    filename = file_path_obj.name
-    file_size = os.path.getsize(file_path)
+    filename = path.name
+    file_size = file_stat.st_size
+    # Sent with either kind of upload, so the server needn't guess it
+    guessed_type, _ = mimetypes.guess_type(filename)
+    content_type = guessed_type or "application/octet-stream"
+    is_wsl_mount = path.parts[:2] == ('/', 'mnt')
+
+    # Optional: direct-to-MinIO upload via presigned URL (bypasses API data path)
+    use_direct = os.getenv("NEBULA_DIRECT_S3", "0").strip().lower() in ("1", "true", "yes", "y")
 
     # WSL fix: Copy Windows filesystem files to Linux temp directory first
-    # This avoids slow/hanging file access from /mnt/c/
-    temp_file_path = None
+    # This avoids slow/hanging file access from /mnt/c/. Direct uploads read
+    # the file sequentially in large blocks, so they stream from /mnt/c/
+    # as is rather than moving every byte twice
+    temp_fd = None
     actual_upload_path = file_path
     
-    if file_path.startswith('/mnt/'):
+    if is_wsl_mount and not use_direct:
         console.print(f"[yellow]📋 Copying file from Windows filesystem to Linux temp...[/yellow]")
         try:
-            temp_dir = tempfile.gettempdir()
-            temp_file_path = os.path.join(temp_dir, f"nebula_upload_{os.getpid()}_{filename}")
-            shutil.copy2(file_path, temp_file_path)
-            actual_upload_path = temp_file_path
+            temp_fd = _copy_to_anonymous_temp(file_path, file_size)
+            actual_upload_path = f"/proc/self/fd/{temp_fd}"
             console.print(f"[green]✅ File copied to Linux filesystem[/green]")
         except Exception as e:
             console.print(f"[yellow]⚠️  Warning: Could not copy to temp: {e}[/yellow]")
             actual_upload_path = file_path
 
-    # Display upload info
-    console.print(f"[blue]📤 Uploading:[/blue] {filename}")
-    console.print(f"[blue]📊 Size:[/blue] {file_size:,} bytes ({file_size / 1024 / 1024:.2f} MB)")
+    # Display upload info: styled pieces assembled directly (no markup to
+    # parse, and brackets in names print as-is), written in one go
+    info = Text.assemble(
+        ("📤 Uploading:", "blue"), f" {filename}\n",
+        ("📊 Size:", "blue"), f" {file_size:,} bytes ({file_size / 1024 / 1024:.2f} MB)"
+    )
     if description:
-        console.print(f"[blue]📝 Description:[/blue] {description}")
+        info.append_text(Text.assemble("\n", ("📝 Description:", "blue"), f" {description}"))
+    console.print(info)
 
+    # No separate /health probe: the first request (presign, or the upload
+    # itself) fails just as fast when the server is down, and saves a round trip
     try:
-        # Test server connectivity
-        console.print(f"[yellow]🔍 Testing server connectivity...[/yellow]")
-        try:
-            with httpx.Client(timeout=5.0) as client:
-                health_response = client.get(f'{server_url}/health')
-                if health_response.status_code != 200:
-                    console.print(f"[red]❌ Server not reachable (status: {health_response.status_code})[/red]")
-                    raise typer.Exit(1)
-            console.print(f"[green]✅ Server is reachable[/green]")
-        except httpx.TimeoutException:
-            console.print(f"[red]❌ Connection timed out connecting to {server_url}/health[/red]")
-            raise typer.Exit(1)
-        except httpx.ConnectError as e:
-            console.print(f"[red]❌ Cannot connect to server: {e}[/red]")
-            raise typer.Exit(1)
-
-        # Optional: direct-to-MinIO upload via presigned URL (bypasses API data path)
-        use_direct = os.getenv("NEBULA_DIRECT_S3", "0").strip().lower() in ("1", "true", "yes", "y")
         if use_direct:
-            _upload_direct_s3(
+            file_info = _upload_direct_s3(
                 actual_upload_path=actual_upload_path,
                 filename=filename,
+                content_type=content_type,
                 file_size=file_size,
                 server_url=server_url,
                 description=description
             )
         else:
-            _upload_via_api(
+            file_info = _upload_via_api(
                 actual_upload_path=actual_upload_path,
                 filename=filename,
+                content_type=content_type,
                 file_size=file_size,
                 server_url=server_url,
                 description=description
             )
 
+        if json_output:
+            print(json.dumps(file_info))
+        return file_info
+
     except typer.Exit:
         raise
+    except httpx.ConnectError as e:
+        console.print(f"[red]❌ Cannot connect to server: {e}[/red]")
+        raise typer.Exit(1)
+    except httpx.ConnectTimeout:
+        console.print(f"[red]❌ Connection timed out connecting to {server_url}[/red]")
+        raise typer.Exit(1)
     except httpx.TimeoutException:
         console.print("[red]❌ Upload timeout[/red]")
         raise typer.Exit(1)
@@ -168,25 +245,20 @@ def upload_file(
         console.print(f"[red]❌ Upload failed: {str(e)}[/red]")
         raise typer.Exit(1)
     finally:
-        # Clean up temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception:
-                pass
+        # The temp copy has no name, so closing it is all the cleanup there is
+        if temp_fd is not None:
+            os.close(temp_fd)
 
 
 def _upload_direct_s3(
     actual_upload_path: str,
     filename: str,
+    content_type: str,
     file_size: int,
     server_url: str,
     description: Optional[str] = None
 ):
     """Upload directly to MinIO via presigned URL with progress bar."""
-    guessed_type, _ = mimetypes.guess_type(filename)
-    content_type = guessed_type or "application/octet-stream"
-
     console.print("[dim]⚡ Using direct MinIO upload (presigned URL)[/dim]")
 
     # Determine network hint
@@ -199,19 +271,64 @@ def _upload_direct_s3(
     elif remote_url and current == remote_url:
         network = "remote"
 
-    # 1) Ask API for presigned PUT URL
+    network_query = f"?network={network}" if network else ""
     presign_payload = {"filename": filename, "content_type": content_type, "description": description}
-    presign_endpoint = f"{server_url}/api/upload/presign"
-    if network:
-        presign_endpoint = f"{presign_endpoint}?network={network}"
-
-    with httpx.Client(timeout=30.0) as client:
-        presign_response = client.post(
-            presign_endpoint,
-            json=presign_payload
-        )
-        presign_response.raise_for_status()
-        presign_data = presign_response.json()
+
+    # 1-2) Upload the file straight to MinIO: in parallel parts when it is
+    # large and the server supports it, otherwise with a single PUT
+    uploaded = None
+    if file_size >= MULTIPART_MIN_BYTES:
+        uploaded = _put_multipart(actual_upload_path, file_size, presign_payload, server_url, network_query)
+    if uploaded is None:
+        uploaded = _put_single(actual_upload_path, file_size, presign_payload, server_url, network_query)
+
+    # 3) Register metadata in DB
+    complete_payload = {
+        **uploaded,
+        "filename": filename,
+        "content_type": content_type,
+        "description": description,
+    }
+    complete_path = "complete-multipart" if "upload_id" in uploaded else "complete"
+
+    complete_response = _get_client().post(
+        f"{server_url}/api/upload/{complete_path}",
+        json=complete_payload,
+        timeout=30.0
+    )
+    complete_response.raise_for_status()
+    result = response_json(complete_response)
+
+    if not result.get("success") or not result.get("file"):
+        console.print(f"[red]❌ Complete returned invalid response[/red]")
+        raise typer.Exit(1)
+
+    file_info = result["file"]
+    console.print(f"[green]✅ Upload successful![/green]")
+    console.print(f"[green]📄 File ID:[/green] {file_info['id']}")
+    console.print(f"[green]📁 Path:[/green] {file_info['file_path']}")
+    console.print(f"[green]🕒 Uploaded:[/green] {file_info['upload_date']}")
+    return file_info
+
+
+def _put_single(
+    actual_upload_path: str,
+    file_size: int,
+    presign_payload: dict,
+    server_url: str,
+    network_query: str
+) -> dict:
+    """PUT the whole file to one presigned URL. Returns the completion fields."""
+    # 1) Ask API for presigned PUT URL
+    presign_endpoint = f"{server_url}/api/upload/presign{network_query}"
+
+    presign_response = _get_client().post(
+        presign_endpoint,
+        json=presign_payload,
+        timeout=30.0
+    )
+    presign_response.raise_for_status()
+    presign_data = response_json(presign_response)
 
     if not presign_data.get("success") or not presign_data.get("upload_url") or not presign_data.get("object_key"):
         console.print(f"[red]❌ Presign returned invalid response[/red]")
@@ -230,71 +347,271 @@ def _upload_direct_s3(
     ) as progress:
         task = progress.add_task("[cyan]Uploading...", total=file_size)
         
-        # Use chunked upload with progress tracking
+        # Slice the body out of a memory map with progress tracking; the
+        # kernel reads ahead instead of a Python read() loop filling buffers
         def upload_generator():
-            bytes_sent = 0
-            with open(actual_upload_path, 'rb') as f:
-                while True:
-                    chunk = f.read(1024 * 1024)  # 1MB chunks
-                    if not chunk:
-                        break
-                    bytes_sent += len(chunk)
-                    progress.update(task, completed=bytes_sent)
-                    yield chunk
+            bytes_shown = 0
+            if file_size:  # mmap can't map an empty file
+                with open(actual_upload_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    for offset in range(0, file_size, UPLOAD_CHUNK_BYTES):
+                        chunk = mm[offset:offset + UPLOAD_CHUNK_BYTES]
+                        yield chunk
+                        sent = offset + len(chunk)
+                        if sent - bytes_shown >= PROGRESS_UPDATE_BYTES:
+                            progress.update(task, completed=sent)
+                            bytes_shown = sent
+            progress.update(task, completed=file_size)
 
         # Use a longer timeout for large file uploads (1 hour)
-        with httpx.Client(timeout=httpx.Timeout(3600.0, connect=30.0)) as client:
-            put_response = client.put(
-                upload_url,
-                content=upload_generator(),
-                headers={
-                    "Content-Type": content_type,
-                    "Content-Length": str(file_size),
-                }
-            )
-            
-            if put_response.status_code not in (200, 201, 204):
-                console.print(f"[red]❌ Direct upload failed: {put_response.status_code}[/red]")
-                raise typer.Exit(1)
-
-    # 3) Register metadata in DB
-    complete_payload = {
-        "object_key": object_key,
-        "filename": filename,
-        "content_type": content_type,
-        "description": description,
-    }
-    
-    with httpx.Client(timeout=30.0) as client:
-        complete_response = client.post(
-            f"{server_url}/api/upload/complete",
-            json=complete_payload
+        put_response = _get_client().put(
+            upload_url,
+            content=upload_generator(),
+            headers={
+                "Content-Type": presign_payload["content_type"],
+                "Content-Length": str(file_size),
+            },
+            timeout=httpx.Timeout(3600.0, connect=30.0)
         )
-        complete_response.raise_for_status()
-        result = complete_response.json()
 
-    if not result.get("success") or not result.get("file"):
-        console.print(f"[red]❌ Complete returned invalid response[/red]")
+        if put_response.status_code not in (200, 201, 204):
+            console.print(f"[red]❌ Direct upload failed: {put_response.status_code}[/red]")
+            raise typer.Exit(1)
+
+    return {"object_key": object_key}
+
+
+def _load_upload_speeds() -> dict:
+    """Measured per-connection upload speeds keyed on server URL ({} if missing or unreadable)."""
+    try:
+        with open(UPLOAD_SPEED_CACHE_FILE) as f:
+            speeds = json.load(f)
+        return speeds if isinstance(speeds, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_upload_speed(server_url: str, bytes_per_second: float):
+    """Remember a server's measured per-connection upload speed for the next upload."""
+    speeds = _load_upload_speeds()
+    speeds[server_url.rstrip('/')] = bytes_per_second
+    try:
+        os.makedirs(os.path.dirname(UPLOAD_SPEED_CACHE_FILE), exist_ok=True)
+        with open(UPLOAD_SPEED_CACHE_FILE, 'w') as f:
+            json.dump(speeds, f)
+    except OSError:
+        pass
+
+
+def _multipart_part_size(file_size: int, bytes_per_second: Optional[float] = None) -> int:
+    """
+    Part size for a multipart upload: about MULTIPART_PART_SECONDS of sending
+    at the measured speed (the minimum size when there's no measurement yet),
+    small enough that every parallel connection gets a part, within the part
+    limit, and in whole chunks.
+    """
+    part_size = MULTIPART_PART_BYTES
+    if bytes_per_second:
+        part_size = int(bytes_per_second * MULTIPART_PART_SECONDS)
+    part_size = min(part_size, MULTIPART_MAX_PART_BYTES, -(-file_size // MULTIPART_JOBS))
+    part_size = max(part_size, MULTIPART_PART_BYTES, -(-file_size // MULTIPART_MAX_PARTS))
+    return -(-part_size // UPLOAD_CHUNK_BYTES) * UPLOAD_CHUNK_BYTES
+
+
+def _put_multipart(
+    actual_upload_path: str,
+    file_size: int,
+    presign_payload: dict,
+    server_url: str,
+    network_query: str
+) -> Optional[dict]:
+    """
+    Upload the file as S3 multipart parts, several at a time, each PUT to its
+    own presigned URL. Returns the completion fields, or None when the server
+    has no multipart endpoint (older servers), so the caller falls back to a
+    single PUT.
+    """
+    client = _get_client()
+    part_size = _multipart_part_size(file_size, _load_upload_speeds().get(server_url.rstrip('/')))
+    part_count = -(-file_size // part_size)
+
+    presign_response = client.post(
+        f"{server_url}/api/upload/presign-multipart{network_query}",
+        json={**presign_payload, "parts": part_count},
+        timeout=30.0
+    )
+    if presign_response.status_code in (404, 405):
+        return None
+    presign_response.raise_for_status()
+    presign_data = response_json(presign_response)
+
+    urls = presign_data.get("urls") or []
+    if not presign_data.get("success") or not presign_data.get("object_key") or len(urls) != part_count:
+        console.print(f"[red]❌ Presign returned invalid response[/red]")
         raise typer.Exit(1)
 
-    file_info = result["file"]
-    console.print(f"[green]✅ Upload successful![/green]")
-    console.print(f"[green]📄 File ID:[/green] {file_info['id']}")
-    console.print(f"[green]📁 Path:[/green] {file_info['file_path']}")
-    console.print(f"[green]🕒 Uploaded:[/green] {file_info['upload_date']}")
+    object_key = presign_data["object_key"]
+    upload_id = presign_data["upload_id"]
+    console.print(f"[dim]🧩 Sending {part_count} parts of {part_size // (1024 * 1024)} MB, {MULTIPART_JOBS} at a time[/dim]")
+
+    with open(actual_upload_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            Progress(
+                BarColumn(),
+                TaskProgressColumn(),
+                TransferSpeedColumn(),
+                TimeRemainingColumn(),
+                console=console
+            ) as progress:
+        task = progress.add_task("[cyan]Uploading...", total=file_size)
+        # (bytes, seconds) per part sent, to size the next upload's parts
+        part_timings = []
+
+        # Part URLs are presigned up front and expire (15 minutes by default),
+        # so a long upload asks for fresh ones when a PUT is refused
+        urls_lock = threading.Lock()
+
+        def refresh_urls(part_number: int, stale_url: str):
+            """Replace the URLs of part_number onwards, unless another part already has."""
+            with urls_lock:
+                if urls[part_number - 1] != stale_url:
+                    return
+                response = client.post(
+                    f"{server_url}/api/upload/presign-parts{network_query}",
+                    json={
+                        "object_key": object_key,
+                        "upload_id": upload_id,
+                        "first_part": part_number,
+                        "parts": part_count - part_number + 1
+                    },
+                    timeout=30.0
+                )
+                response.raise_for_status()
+                urls[part_number - 1:] = response_json(response)["urls"]
+
+        def put_part(part_number: int) -> dict:
+            start = (part_number - 1) * part_size
+            end = min(start + part_size, file_size)
+            for attempt in range(1, MULTIPART_PART_ATTEMPTS + 1):
+                sent = 0
+
+                def part_body() -> Iterator[bytes]:
+                    nonlocal sent
+                    for offset in range(start, end, UPLOAD_CHUNK_BYTES):
+                        chunk = mm[offset:min(offset + UPLOAD_CHUNK_BYTES, end)]
+                        yield chunk
+                        sent += len(chunk)
+                        progress.advance(task, len(chunk))
+
+                url = urls[part_number - 1]
+                try:
+                    started = time.perf_counter()
+                    response = client.put(
+                        url,
+                        content=part_body(),
+                        headers={"Content-Length": str(end - start)}
+                    )
+                    response.raise_for_status()
+                    part_timings.append((end - start, time.perf_counter() - started))
+                except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                    # Take the failed try's bytes back off the bar before retrying
+                    progress.advance(task, -sent)
+                    if attempt == MULTIPART_PART_ATTEMPTS:
+                        raise
+                    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 403:
+                        refresh_urls(part_number, url)
+                    continue
+                etag = response.headers.get("etag")
+                if not etag:
+                    raise RuntimeError(f"Storage returned no ETag for part {part_number}")
+                return {"part_number": part_number, "etag": etag.strip('"')}
+
+        with ThreadPoolExecutor(max_workers=MULTIPART_JOBS) as executor:
+            try:
+                parts = list(executor.map(put_part, range(1, part_count + 1)))
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                # Best effort: don't leave orphaned parts in the bucket
+                try:
+                    client.post(
+                        f"{server_url}/api/upload/abort-multipart",
+                        json={"object_key": object_key, "upload_id": upload_id},
+                        timeout=30.0
+                    )
+                except httpx.HTTPError:
+                    pass
+                raise
+
+    sent_bytes = sum(size for size, _ in part_timings)
+    sent_seconds = sum(seconds for _, seconds in part_timings)
+    if sent_seconds > 0:
+        _save_upload_speed(server_url, sent_bytes / sent_seconds)
+
+    return {"object_key": object_key, "upload_id": upload_id, "parts": parts}
+
+
+def _multipart_body(
+    file_path: str,
+    file_size: int,
+    filename: str,
+    content_type: str,
+    description: Optional[str],
+    progress: Progress,
+    task_id
+) -> Tuple[str, int, Iterator[bytes]]:
+    """
+    Build a multipart/form-data upload body around a memory-mapped file.
+
+    Returns (content_type, content_length, chunks). The file part is sliced
+    straight out of the page cache rather than read() into buffers first, and
+    the progress bar advances as the chunks are sent.
+    """
+    boundary = f"nebula-{os.urandom(8).hex()}"
+    quoted_name = filename.replace('\\', '\\\\').replace('"', '%22')
+    head = b""
+    if description:
+        head += (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="description"\r\n\r\n'
+            f'{description}\r\n'
+        ).encode()
+    head += (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{quoted_name}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'
+    ).encode()
+    tail = f'\r\n--{boundary}--\r\n'.encode()
+
+    def chunks() -> Iterator[bytes]:
+        yield head
+        bytes_shown = 0
+        if file_size:  # mmap can't map an empty file
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                for offset in range(0, file_size, UPLOAD_CHUNK_BYTES):
+                    chunk = mm[offset:offset + UPLOAD_CHUNK_BYTES]
+                    yield chunk
+                    sent = offset + len(chunk)
+                    if sent - bytes_shown >= PROGRESS_UPDATE_BYTES:
+                        progress.update(task_id, completed=sent)
+                        bytes_shown = sent
+        progress.update(task_id, completed=file_size)
+        yield tail
+
+    return f"multipart/form-data; boundary={boundary}", len(head) + file_size + len(tail), chunks()
 
 
 def _upload_via_api(
     actual_upload_path: str,
     filename: str,
+    content_type: str,
     file_size: int,
     server_url: str,
     description: Optional[str] = None
 ):
     """Upload via API endpoint with progress bar."""
-    
-    # For multipart uploads, we need to track progress differently
-    # We'll read the file in chunks and track as we build the request
     with Progress(
         BarColumn(),
         TaskProgressColumn(),
@@ -303,40 +620,21 @@ def _upload_via_api(
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Uploading...", total=file_size)
-        
-        # Read file content with progress tracking
-        # For multipart, we need to read the whole file but track progress
-        file_content = bytearray()
-        bytes_read = 0
-        
-        with open(actual_upload_path, 'rb') as f:
-            while True:
-                chunk = f.read(1024 * 1024)  # 1MB chunks
-                if not chunk:
-                    break
-                file_content.extend(chunk)
-                bytes_read += len(chunk)
-                progress.update(task, completed=bytes_read)
-        
-        # Now send the multipart form
-        progress.update(task, description="[cyan]Sending to server...")
-        
-        files = {
-            'file': (filename, bytes(file_content), 'application/octet-stream')
-        }
-        data = {}
-        if description:
-            data['description'] = description
-        
-        # Use a longer timeout for large file uploads (10 minutes)
-        with httpx.Client(timeout=httpx.Timeout(600.0, connect=30.0)) as client:
-            response = client.post(
-                f'{server_url}/api/upload',
-                files=files,
-                data=data if data else None
-            )
+
+        # Stream the file from a memory map into a hand-built multipart body,
+        # so nothing is buffered in memory
+        body_type, content_length, body = _multipart_body(
+            actual_upload_path, file_size, filename, content_type, description, progress, task
+        )
+        with _get_client().stream(
+            'POST',
+            f'{server_url}/api/upload',
+            content=body,
+            headers={'Content-Type': body_type, 'Content-Length': str(content_length)}
+        ) as response:
+            response.read()
             response.raise_for_status()
-            result = response.json()
+            result = response_json(response)
 
     # Display success
     file_info = result['file']
@@ -344,3 +642,4 @@ def _upload_via_api(
     console.print(f"[green]📄 File ID:[/green] {file_info['id']}")
     console.print(f"[green]📁 Path:[/green] {file_info['file_path']}")
     console.print(f"[green]🕒 Uploaded:[/green] {file_info['upload_date']}")
+    return file_info
@@ -0,0 +1,134 @@
+# HTTP client - shared keep-alive connection pool for CLI commands
+
+import atexit
+import functools
+import json
+import os
+from typing import Optional
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Idle pooled connections are kept this long (seconds) before being closed
+KEEPALIVE_EXPIRY = 30.0
+
+_client: Optional[httpx.Client] = None
+_session = None
+_console = None
+
+
+def json_loads(data):
+    """Decode JSON from bytes or str, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def response_json(response):
+    """
+    Decode a response body as JSON (the faster equivalent of response.json()).
+    Works with httpx and requests responses alike.
+    """
+    return json_loads(response.content)
+
+
+def response_snippet(response, limit: int = 200) -> str:
+    """
+    The start of a response body as text, for error messages. Only the first
+    limit bytes are decoded, rather than the whole body as response.text does.
+    """
+    return response.content[:limit].decode('utf-8', 'replace')
+
+
+def http2_supported() -> bool:
+    """Whether the h2 package httpx needs for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401 - only checking that HTTP/2 support is installed
+        return True
+    except ImportError:
+        return False
+
+
+def get_client() -> httpx.Client:
+    """
+    Return the process-wide HTTP client, creating it on first use.
+
+    Commands pass absolute URLs (the server URL can differ per call), and
+    override the default timeout per request where they need to. Requests to
+    the same host reuse pooled connections, negotiating HTTP/2 where the
+    server offers it.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            http2=http2_supported(),
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=KEEPALIVE_EXPIRY),
+            timeout=httpx.Timeout(30.0, connect=10.0)
+        )
+        atexit.register(close_client)
+    return _client
+
+
+def close_client():
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+def get_session():
+    """
+    Return the process-wide requests.Session, creating it on first use.
+
+    For the commands built on requests (system, transcode, ping and the
+    local-server probe). Because the probe goes through it too, the command
+    that follows reuses its already-open connection. No retries: restarts
+    are not idempotent, and callers report failures themselves.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=20, max_retries=0)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        atexit.register(_session.close)
+    return _session
+
+
+def with_session(command):
+    """
+    Decorator for requests-based commands, which take the shared session as
+    their first argument.
+
+    Fills in server_url from NEBULA_SERVER_URL when not given, and reports
+    timeouts, connection failures and other errors the command doesn't
+    handle itself.
+    """
+    @functools.wraps(command)
+    def wrapper(*args, server_url: Optional[str] = None, **kwargs):
+        import requests
+        from rich.console import Console
+        global _console
+        if _console is None:
+            _console = Console()
+
+        server_url = server_url or os.getenv("NEBULA_SERVER_URL")
+        if not server_url:
+            _console.print("[red]Error: NEBULA_SERVER_URL environment variable not set[/red]")
+            return None
+        try:
+            return command(get_session(), *args, server_url=server_url, **kwargs)
+        except requests.exceptions.Timeout:
+            _console.print("[red]Error: Request timed out[/red]")
+        except requests.exceptions.ConnectionError:
+            _console.print(f"[red]Error: Cannot connect to server at {server_url}[/red]")
+        except Exception as e:
+            _console.print(f"[red]Error: {e}[/red]")
+        return None
+    return wrapper
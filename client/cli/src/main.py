@@ -1,8 +1,7 @@
 import os
 import sys
 import typer
-import requests
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 from rich.console import Console
@@ -37,8 +36,10 @@ def get_server_url() -> str:
     
     # If both are configured, try local first with quick timeout
     if local_url and remote_url:
+        from .http_client import get_session
         try:
-            response = requests.get(f"{local_url}/health", timeout=1.5)
+            # Through the shared session, so the command reuses this connection
+            response = get_session().get(f"{local_url}/health", timeout=1.5)
             if response.status_code == 200:
                 console.print("[dim]🏠 Using LOCAL network (fast)[/dim]")
                 return local_url
@@ -54,23 +55,18 @@ def get_server_url() -> str:
 # Get the best available server URL
 SERVER_URL = get_server_url()
 
-# Import commands
-from .commands.upload import upload_file
-from .commands.list import list_files
-from .commands.download import download_file
-from .commands.status import show_system_health
-from .commands.play import play_file
-from .commands.transcode import transcode_file, get_transcode_status, list_transcode_jobs, cancel_transcode_job
-from .commands.system import show_logs, restart_service, show_container_status
-from .commands.benchmark import run_benchmark
+# Command modules are imported inside each command, so starting the CLI (or
+# printing --help) doesn't load httpx, psutil, rich.progress etc. for
+# commands that aren't run
 
 @app.command()
 def ping():
     """Connectivity check to the remote server."""
+    from .http_client import get_session
     console.print("[yellow]📡 Contacting Nebula Server...[/yellow]")
     try:
         # Calling the health endpoint on your old laptop
-        r = requests.get(f"{SERVER_URL}/health", timeout=5)
+        r = get_session().get(f"{SERVER_URL}/health", timeout=5)
         if r.status_code == 200:
             console.print("[bold green]🏓 PONG![/bold green] Server is alive.")
         else:
@@ -81,12 +77,14 @@ def ping():
 @app.command()
 def upload(
     file_path: str = typer.Argument(..., help="Path to the file to upload"),
-    description: Optional[str] = typer.Option(None, help="Optional description for the file")
+    description: Optional[str] = typer.Option(None, help="Optional description for the file"),
+    json_output: bool = typer.Option(False, "--json", help="Also print the uploaded file's metadata as a JSON line")
 ):
     """
     Upload a file to Nebula Cloud
     """
-    upload_file(file_path, server_url=SERVER_URL, description=description)
+    from .commands.upload import upload_file
+    upload_file(file_path, server_url=SERVER_URL, description=description, json_output=json_output)
 
 @app.command()
 def list(
@@ -96,19 +94,29 @@ def list(
     """
     List all uploaded files with metadata
     """
+    from .commands.list import list_files
     list_files(server_url=SERVER_URL, limit=limit, skip=skip)
 
 @app.command()
 def download(
-    file_id: int = typer.Argument(..., help="ID of the file to download"),
-    output_path: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path (defaults to original filename)")
+    file_ids: List[int] = typer.Argument(..., help="ID(s) of the file(s) to download"),
+    output_path: Optional[str] = typer.Option(None, "--output", "-o", help="Output file path (defaults to original filename); a directory when several IDs are given"),
+    connections: Optional[int] = typer.Option(None, "--connections", "-c", help="Parallel range connections for large files (default: NEBULA_DOWNLOAD_CONNECTIONS or 4)"),
+    chunk_size: Optional[int] = typer.Option(None, "--chunk-size", help="Fixed read size in bytes for response bodies (default: NEBULA_DOWNLOAD_CHUNK, else adapted to throughput; 1 MiB for several IDs)"),
+    jobs: Optional[int] = typer.Option(None, "--jobs", "-j", help="Files downloaded at once when several IDs are given (default: NEBULA_DOWNLOAD_JOBS or 4)")
 ):
     """
-    Download a file from Nebula Cloud by its ID.
+    Download files from Nebula Cloud by ID.
 
-    Preserves original filename if no output path is specified.
+    Preserves original filenames if no output path is specified. Several IDs
+    are downloaded concurrently, and interrupted batch downloads resume.
     """
-    download_file(file_id, output_path, server_url=SERVER_URL)
+    if len(file_ids) == 1:
+        from .commands.download import download_file
+        download_file(file_ids[0], output_path, server_url=SERVER_URL, connections=connections, chunk_size=chunk_size)
+    else:
+        from .commands.download import download_files
+        download_files(file_ids, output_dir=output_path, server_url=SERVER_URL, jobs=jobs, chunk_size=chunk_size)
 
 @app.command()
 def status(
@@ -120,6 +128,7 @@ def status(
 
     Shows CPU, memory, disk usage, network stats, and server health.
     """
+    from .commands.status import show_system_health
     show_system_health(show_local=show_local, show_server=show_server, server_url=SERVER_URL)
 
 @app.command()
@@ -133,6 +142,7 @@ def play(
 
     Supports seeking. Use --quality to stream a transcoded version.
     """
+    from .commands.play import play_file
     play_file(file_id, player=player, quality=quality, server_url=SERVER_URL)
 
 
@@ -147,6 +157,7 @@ def transcode(
     Creates 480p and 720p versions by default. Runs in background.
     """
     quality_list = [int(q.strip()) for q in qualities.split(",")]
+    from .commands.transcode import transcode_file
     transcode_file(file_id, qualities=quality_list, server_url=SERVER_URL)
 
 
@@ -160,6 +171,7 @@ def transcode_status(
 
     Shows progress of all transcoding jobs for the file.
     """
+    from .commands.transcode import get_transcode_status
     get_transcode_status(file_id, watch=watch, server_url=SERVER_URL)
 
 
@@ -173,6 +185,7 @@ def transcode_jobs(
 
     Shows recent transcoding jobs across all files.
     """
+    from .commands.transcode import list_transcode_jobs
     list_transcode_jobs(status=status, limit=limit, server_url=SERVER_URL)
 
 
@@ -183,20 +196,23 @@ def transcode_cancel(
     """
     Cancel a pending or processing transcoding job.
     """
+    from .commands.transcode import cancel_transcode_job
     cancel_transcode_job(job_id, server_url=SERVER_URL)
 
 
 @app.command()
 def logs(
     service: Optional[str] = typer.Argument(None, help="Service name: api, worker, db, s3, queue (omit for all)"),
-    lines: int = typer.Option(100, "--lines", "-n", help="Number of log lines to fetch")
+    lines: int = typer.Option(100, "--lines", "-n", help="Number of log lines to fetch"),
+    parallel: bool = typer.Option(False, "--parallel", help="For all services, fetch each service's logs concurrently")
 ):
     """
     View server logs.
 
     Shows logs from Docker containers. Specify a service or omit for all.
     """
-    show_logs(service=service, lines=lines, server_url=SERVER_URL)
+    from .commands.system import show_logs
+    show_logs(service=service, lines=lines, parallel=parallel, server_url=SERVER_URL)
 
 
 @app.command()
@@ -209,6 +225,7 @@ def restart(
 
     Restart a specific service or all services. Use with caution.
     """
+    from .commands.system import restart_service
     restart_service(service=service, force=force, server_url=SERVER_URL)
 
 
@@ -219,6 +236,7 @@ def containers():
 
     Displays running state of api, worker, db, s3, and queue containers.
     """
+    from .commands.system import show_container_status
     show_container_status(server_url=SERVER_URL)
 
 
@@ -228,7 +246,14 @@ def benchmark(
     server_url: Optional[str] = typer.Option(None, "--server", "-s", help="Nebula server URL (uses NEBULA_SERVER_URL env var if not specified)"),
     output: Optional[str] = typer.Option(None, "--output", "-o", help="Save results to JSON file"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging"),
-    skip_transcode: bool = typer.Option(False, "--skip-transcode", help="Skip transcoding benchmark (faster)")
+    skip_transcode: bool = typer.Option(False, "--skip-transcode", help="Skip transcoding benchmark (faster)"),
+    no_progress: bool = typer.Option(False, "--no-progress", help="Disable progress bars while streaming (lower client overhead)"),
+    parallel_phases: bool = typer.Option(False, "--parallel-phases", help="Overlap the range stream and transcoding with the full stream (faster, less isolated numbers)"),
+    zero_copy_upload: bool = typer.Option(False, "--zero-copy-upload", help="Upload with sendfile(2) over a raw socket (http:// only)"),
+    use_tqdm: bool = typer.Option(False, "--tqdm", help="Use tqdm progress bars instead of the lightweight progress line"),
+    use_subprocess: bool = typer.Option(False, "--subprocess", help="Run upload/download through the nebula executable instead of in-process"),
+    parallel_streams: int = typer.Option(1, "--parallel-streams", help="Also measure aggregate throughput of N concurrent full-file streams"),
+    download_to_null: bool = typer.Option(False, "--download-to-null", help="Also measure the download with bytes discarded instead of written to disk")
 ):
     """
     Run comprehensive performance benchmark.
@@ -236,7 +261,8 @@ def benchmark(
     Tests upload, download, streaming, and transcoding performance.
     Measures throughput, latency, and identifies bottlenecks.
     """
-    run_benchmark(file_path=file_path, server_url=server_url or SERVER_URL, output=output, verbose=verbose, skip_transcode=skip_transcode)
+    from .commands.benchmark import run_benchmark
+    run_benchmark(file_path=file_path, server_url=server_url or SERVER_URL, output=output, verbose=verbose, skip_transcode=skip_transcode, no_progress=no_progress, parallel_phases=parallel_phases, zero_copy_upload=zero_copy_upload, use_tqdm=use_tqdm, use_subprocess=use_subprocess, parallel_streams=parallel_streams, download_to_null=download_to_null)
 
 
 # Adding a callback ensures the 'Commands' section is generated
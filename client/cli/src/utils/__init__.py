@@ -0,0 +1 @@
+# CLI shared helpers package
@@ -0,0 +1,12 @@
+# Format helpers - human readable values shared by CLI commands
+
+# Unit for each power of 1024, indexed by bit_length // 10
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def format_bytes(bytes_value: int) -> str:
+    """Format bytes to human readable format"""
+    index = min((bytes_value.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    if index <= 0:
+        return f"{bytes_value} B"
+    return f"{bytes_value / (1 << (10 * index)):.1f} {_SIZE_UNITS[index]}"
@@ -6,11 +6,35 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.file import File
 from app.core.s3_client import minio_client
+from functools import lru_cache
+from typing import Any, Dict, Optional
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=256)
+def _cached_variant_info(object_key: str) -> Dict[str, Any]:
+    info = minio_client.get_file_info(object_key)
+    if info is None:
+        # Raising keeps misses out of the cache
+        raise FileNotFoundError(object_key)
+    return info
+
+
+def get_variant_info(object_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Stat a transcoded variant in MinIO, caching the result per object key.
+
+    Variants are written once by the worker, but players issue many range
+    requests per playback; caching saves a MinIO round-trip on each one.
+    """
+    try:
+        return _cached_variant_info(object_key)
+    except FileNotFoundError:
+        return None
+
 @router.get("/files/{file_id}/download-url")
 async def get_download_url(
     file_id: int,
@@ -35,7 +59,7 @@ async def get_download_url(
         if quality_key in file.transcoded_variants:
             object_key = file.transcoded_variants[quality_key]
             filename = f"{file.filename.rsplit('.', 1)[0]}_{quality}p.{file.filename.rsplit('.', 1)[-1]}" if "." in file.filename else f"{file.filename}_{quality}p"
-            file_info = minio_client.get_file_info(object_key)
+            file_info = get_variant_info(object_key)
             if file_info and file_info.get("content_type"):
                 content_type = file_info["content_type"]
 
@@ -74,7 +98,7 @@ async def get_stream_url(
         quality_key = str(quality)
         if quality_key in file.transcoded_variants:
             object_key = file.transcoded_variants[quality_key]
-            file_info = minio_client.get_file_info(object_key)
+            file_info = get_variant_info(object_key)
             if file_info and file_info.get("content_type"):
                 content_type = file_info["content_type"]
 
@@ -170,7 +194,7 @@ async def stream_file(
             if quality_key in file.transcoded_variants:
                 stream_path = file.transcoded_variants[quality_key]
                 # Get transcoded file size from MinIO
-                file_info = minio_client.get_file_info(stream_path)
+                file_info = get_variant_info(stream_path)
                 if file_info:
                     file_size = file_info["size"]
                     logger.info(f"Streaming {quality}p version: {stream_path}")
@@ -1,17 +1,30 @@
 # Transcoding API endpoints - trigger transcoding, check status, list jobs
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+import asyncio
+import hashlib
+import json
+import time
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.models import File, TranscodingJob
 from app.worker import transcode_video_task
 
 router = APIRouter()
 
+# Transcode event stream: how often job state is re-read, how often an idle
+# stream gets a keepalive comment, and how long one stream may stay open (seconds)
+EVENTS_CHECK_INTERVAL = 1.0
+EVENTS_KEEPALIVE_INTERVAL = 15.0
+EVENTS_MAX_DURATION = 3600.0
+
 
 # Pydantic models for request/response
 class TranscodeRequest(BaseModel):
@@ -140,11 +153,13 @@ def trigger_transcode(request: TranscodeRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/transcode/{file_id}", response_model=TranscodeStatusResponse)
-def get_transcode_status(file_id: int, db: Session = Depends(get_db)):
+def get_transcode_status(file_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get transcoding status for a file
 
-    Returns all transcoding jobs and available qualities.
+    Returns all transcoding jobs and available qualities. Responses carry an
+    ETag; pollers that send it back in If-None-Match get a bodiless 304 until
+    something about the jobs changes.
     """
     file = db.query(File).filter(File.id == file_id).first()
     if not file:
@@ -155,6 +170,15 @@ def get_transcode_status(file_id: int, db: Session = Depends(get_db)):
         TranscodingJob.file_id == file_id
     ).order_by(TranscodingJob.created_at.desc()).all()
 
+    state = repr((
+        [(job.id, job.status, job.progress, job.completed_at) for job in jobs],
+        file.transcoded_variants
+    ))
+    etag = f'W/"{hashlib.sha1(state.encode()).hexdigest()[:16]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     job_responses = []
     for job in jobs:
         job_responses.append(TranscodeJobResponse(
@@ -182,6 +206,74 @@ def get_transcode_status(file_id: int, db: Session = Depends(get_db)):
     )
 
 
+def _job_events_payload(file_id: int) -> List[dict]:
+    """A file's jobs as sent by the event stream, read through a session closed right after."""
+    session = SessionLocal()
+    try:
+        jobs = session.query(TranscodingJob).filter(
+            TranscodingJob.file_id == file_id
+        ).order_by(TranscodingJob.created_at.desc()).all()
+
+        return [{
+            "id": job.id,
+            "target_quality": job.target_quality,
+            "status": job.status,
+            "progress": job.progress or 0,
+            "error_message": job.error_message,
+            "started_at": job.started_at,
+            "completed_at": job.completed_at,
+        } for job in jobs]
+    finally:
+        session.close()
+
+
+@router.get("/transcode/{file_id}/events")
+def stream_transcode_events(file_id: int):
+    """
+    Server-sent events with the status of a file's transcoding jobs
+
+    Sends the job list whenever it changes and closes the stream once no job is
+    pending or processing, so clients wait on one connection instead of polling.
+    """
+    # Not the get_db dependency: that session is only closed once the response
+    # ends, and would keep its connection checked out for the whole stream
+    session = SessionLocal()
+    try:
+        found = session.query(File.id).filter(File.id == file_id).first()
+    finally:
+        session.close()
+    if not found:
+        raise HTTPException(status_code=404, detail=f"File {file_id} not found")
+
+    async def event_stream():
+        # Async, so an open stream holds neither a worker thread nor (between
+        # checks) a pooled DB connection: each check runs in the threadpool
+        # through its own short-lived session, and the wait is asyncio.sleep
+        last_payload = None
+        last_sent = time.monotonic()
+        deadline = last_sent + EVENTS_MAX_DURATION
+        while time.monotonic() < deadline:
+            payload = await run_in_threadpool(_job_events_payload, file_id)
+
+            if payload != last_payload:
+                yield f"data: {json.dumps({'file_id': file_id, 'jobs': payload}, default=str)}\n\n"
+                last_payload = payload
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= EVENTS_KEEPALIVE_INTERVAL:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+            if not any(job["status"] in ("pending", "processing") for job in payload):
+                break
+            await asyncio.sleep(EVENTS_CHECK_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/transcode/job/{job_id}")
 def get_job_status(job_id: int, db: Session = Depends(get_db)):
     """
@@ -214,32 +306,51 @@ def get_job_status(job_id: int, db: Session = Depends(get_db)):
 @router.get("/transcode/jobs/all")
 def list_all_jobs(
     status: Optional[str] = Query(None, description="Filter by status: pending, processing, completed, failed"),
+    ids: Optional[str] = Query(None, description="Comma-separated job IDs, e.g. 1,2,3"),
     limit: int = Query(50, ge=1, le=200),
     skip: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """
     List all transcoding jobs with optional filtering
+
+    Passing ids lets clients poll several specific jobs in one request.
     """
     query = db.query(TranscodingJob)
 
     if status:
         query = query.filter(TranscodingJob.status == status)
 
+    if ids:
+        try:
+            job_ids = [int(job_id) for job_id in ids.split(",") if job_id.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+        query = query.filter(TranscodingJob.id.in_(job_ids))
+
     total = query.count()
-    jobs = query.order_by(TranscodingJob.created_at.desc()).offset(skip).limit(limit).all()
+
+    # Fetch each job's filename in the same query instead of one lookup per job
+    rows = (
+        query.outerjoin(File, File.id == TranscodingJob.file_id)
+        .add_columns(File.filename)
+        .order_by(TranscodingJob.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
     job_list = []
-    for job in jobs:
-        file = db.query(File).filter(File.id == job.file_id).first()
+    for job, filename in rows:
         job_list.append({
             "job_id": job.id,
             "file_id": job.file_id,
-            "filename": file.filename if file else "unknown",
+            "filename": filename or "unknown",
             "target_quality": job.target_quality,
             "status": job.status,
             "progress": job.progress or 0,
             "created_at": job.created_at,
+            "started_at": job.started_at,
             "completed_at": job.completed_at,
         })
 
@@ -1,12 +1,15 @@
 # File upload endpoint - handles multipart uploads, streams to MinIO, saves metadata to DB
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, Query
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
+import json
 import mimetypes
 import logging
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from pydantic import BaseModel
 
 from app.services.file_service import upload_file, generate_file_key
@@ -30,6 +33,17 @@ class PresignUploadResponse(BaseModel):
     upload_url: str
 
 
+class PresignMultipartRequest(PresignUploadRequest):
+    parts: int
+
+
+class PresignMultipartResponse(BaseModel):
+    success: bool
+    object_key: str
+    upload_id: str
+    urls: List[str]
+
+
 class CompleteUploadRequest(BaseModel):
     object_key: str
     filename: str
@@ -39,6 +53,37 @@ class CompleteUploadRequest(BaseModel):
     file_hash: Optional[str] = None
 
 
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+
+class CompleteMultipartRequest(CompleteUploadRequest):
+    upload_id: str
+    parts: List[UploadedPart]
+
+
+class PresignPartsRequest(BaseModel):
+    object_key: str
+    upload_id: str
+    first_part: int
+    parts: int
+
+
+class PresignPartsResponse(BaseModel):
+    success: bool
+    urls: List[str]
+
+
+class AbortMultipartRequest(BaseModel):
+    object_key: str
+    upload_id: str
+
+
+# S3 allows at most this many parts per multipart upload
+MAX_UPLOAD_PARTS = 10000
+
+
 @router.post("/upload/presign", response_model=PresignUploadResponse)
 async def presign_upload(
     body: PresignUploadRequest,
@@ -74,6 +119,101 @@ async def complete_upload(
     """
     After a client uploads directly to MinIO via presigned URL, register the file in DB.
     """
+    _check_upload_request(body)
+    return _register_uploaded_object(body, db)
+
+
+@router.post("/upload/presign-multipart", response_model=PresignMultipartResponse)
+async def presign_multipart_upload(
+    body: PresignMultipartRequest,
+    network: str | None = Query(default=None, description="Presign network hint: local|remote|auto"),
+):
+    """
+    Start a multipart upload and presign a PUT URL per part, so the client can
+    send parts to MinIO in parallel. Client must call /api/upload/complete-multipart
+    with each part's ETag afterwards (or /api/upload/abort-multipart on failure).
+    """
+    if not body.filename:
+        raise HTTPException(status_code=400, detail="filename is required")
+    if not 1 <= body.parts <= MAX_UPLOAD_PARTS:
+        raise HTTPException(status_code=400, detail=f"parts must be between 1 and {MAX_UPLOAD_PARTS}")
+
+    content_type = body.content_type
+    if not content_type or content_type == "application/octet-stream":
+        guessed_type, _ = mimetypes.guess_type(body.filename)
+        content_type = guessed_type or "application/octet-stream"
+
+    object_key = generate_file_key(body.filename)
+    try:
+        upload_id = minio_client.create_multipart_upload(object_key, content_type)
+        urls = minio_client.get_presigned_part_urls(object_key, upload_id, body.parts, network=network)
+        return {"success": True, "object_key": object_key, "upload_id": upload_id, "urls": urls}
+    except Exception as e:
+        logger.error(f"Failed to presign multipart upload for {object_key}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create upload urls: {str(e)}")
+
+
+@router.post("/upload/presign-parts", response_model=PresignPartsResponse)
+async def presign_upload_parts(
+    body: PresignPartsRequest,
+    network: str | None = Query(default=None, description="Presign network hint: local|remote|auto"),
+):
+    """
+    Presign fresh PUT URLs for parts of a started multipart upload, for uploads
+    that outlive the URLs from /api/upload/presign-multipart.
+    """
+    if not body.object_key.startswith("uploads/"):
+        raise HTTPException(status_code=400, detail="Invalid object_key")
+    if body.first_part < 1 or body.parts < 1 or body.first_part + body.parts - 1 > MAX_UPLOAD_PARTS:
+        raise HTTPException(status_code=400, detail=f"part numbers must be between 1 and {MAX_UPLOAD_PARTS}")
+    try:
+        urls = minio_client.get_presigned_part_urls(
+            body.object_key, body.upload_id, body.parts, network=network, first_part=body.first_part
+        )
+        return {"success": True, "urls": urls}
+    except Exception as e:
+        logger.error(f"Failed to presign parts for {body.object_key}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to create upload urls: {str(e)}")
+
+
+@router.post("/upload/complete-multipart")
+async def complete_multipart_upload(
+    body: CompleteMultipartRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Assemble a multipart upload from its parts, then register the file in DB.
+    """
+    _check_upload_request(body)
+    if not body.parts:
+        raise HTTPException(status_code=400, detail="parts are required")
+
+    parts = sorted((part.part_number, part.etag) for part in body.parts)
+    try:
+        minio_client.complete_multipart_upload(body.object_key, body.upload_id, parts)
+    except Exception as e:
+        logger.error(f"Failed to complete multipart upload for {body.object_key}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to complete upload: {str(e)}")
+    return _register_uploaded_object(body, db)
+
+
+@router.post("/upload/abort-multipart")
+async def abort_multipart_upload(body: AbortMultipartRequest):
+    """
+    Discard an unfinished multipart upload and the parts already stored.
+    """
+    if not body.object_key.startswith("uploads/"):
+        raise HTTPException(status_code=400, detail="Invalid object_key")
+    try:
+        minio_client.abort_multipart_upload(body.object_key, body.upload_id)
+        return {"success": True}
+    except Exception as e:
+        logger.error(f"Failed to abort multipart upload for {body.object_key}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to abort upload: {str(e)}")
+
+
+def _check_upload_request(body: CompleteUploadRequest) -> None:
+    """Reject completions without a filename or outside our upload prefix."""
     if not body.object_key or not body.filename:
         raise HTTPException(status_code=400, detail="object_key and filename are required")
 
@@ -81,6 +221,9 @@ async def complete_upload(
     if not body.object_key.startswith("uploads/"):
         raise HTTPException(status_code=400, detail="Invalid object_key")
 
+
+def _register_uploaded_object(body: CompleteUploadRequest, db: Session):
+    """Save metadata for an object uploaded directly to MinIO."""
     # Verify object exists in MinIO and obtain size/content-type
     info = minio_client.get_file_info(body.object_key)
     if not info:
@@ -203,6 +346,7 @@ async def list_files_endpoint(
     user_id: Optional[int] = None,
     limit: int = 50,
     offset: int = 0,
+    format: Optional[str] = Query(None, description="'ndjson' streams one file object per line"),
     db: Session = Depends(get_db)
 ):
     """
@@ -211,7 +355,23 @@ async def list_files_endpoint(
     - **user_id**: Optional filter by user
     - **limit**: Maximum number of results (default: 50)
     - **offset**: Pagination offset (default: 0)
+    - **format**: 'ndjson' to stream files as they are read instead of one JSON document
     """
+    if format == "ndjson":
+        from app.services.file_service import iter_files
+
+        def ndjson_lines():
+            # The request's session is released once the response starts, so the
+            # stream reads through its own
+            session = SessionLocal()
+            try:
+                for file in iter_files(db=session, user_id=user_id, limit=limit, offset=offset):
+                    yield json.dumps(jsonable_encoder(file)) + "\n"
+            finally:
+                session.close()
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
     try:
         from app.services.file_service import list_files
         files = list_files(db=db, user_id=user_id, limit=limit, offset=offset)
@@ -229,20 +389,32 @@ async def list_files_endpoint(
 @router.get("/files/{file_id}")
 async def get_file_info_endpoint(
     file_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific file
 
     - **file_id**: The file ID to retrieve
+
+    Responses carry an ETag; clients that send it back in If-None-Match get a
+    bodiless 304 (without the MinIO lookup) while the file's record is unchanged.
     """
     try:
-        from app.services.file_service import get_file_info
-        file_info = get_file_info(file_id=file_id, db=db)
+        from app.services.file_service import get_file_by_id, file_info_etag, describe_file
+        file_record = get_file_by_id(file_id=file_id, db=db)
 
-        if not file_info:
+        if not file_record:
             raise HTTPException(status_code=404, detail="File not found")
 
+        etag = file_info_etag(file_record)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        file_info = describe_file(file_record)
+
         return {
             "success": True,
             "file": file_info
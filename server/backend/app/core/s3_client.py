@@ -1,8 +1,9 @@
 # MinIO client initialization and S3-compatible storage operations wrapper
 
 from minio import Minio
+from minio.datatypes import Part
 from minio.error import S3Error
-from typing import BinaryIO, Optional, Dict, Any
+from typing import BinaryIO, Optional, Dict, Any, List, Tuple
 import io
 import os
 from datetime import timedelta
@@ -314,6 +315,91 @@ class MinIOClient:
         except S3Error as e:
             raise Exception(f"Failed to create presigned PUT url for '{object_name}': {e}")
 
+    def create_multipart_upload(self, object_name: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Start a multipart upload whose parts the client PUTs directly via presigned URLs.
+
+        Args:
+            object_name: S3 object key
+            content_type: MIME type of the assembled object
+
+        Returns:
+            str: Upload ID
+        """
+        try:
+            return self.client._create_multipart_upload(
+                self.bucket_name, object_name, {"Content-Type": content_type}
+            )
+        except S3Error as e:
+            raise Exception(f"Failed to start multipart upload for '{object_name}': {e}")
+
+    def get_presigned_part_urls(
+        self,
+        object_name: str,
+        upload_id: str,
+        parts: int,
+        expires_seconds: Optional[int] = None,
+        network: Optional[str] = None,
+        first_part: int = 1,
+    ) -> List[str]:
+        """
+        Generate presigned PUT URLs for parts first_part..first_part + parts - 1 of a multipart upload.
+
+        Args:
+            object_name: S3 object key
+            upload_id: ID from create_multipart_upload
+            parts: Number of parts
+            expires_seconds: Expiry in seconds (default from env S3_PRESIGN_EXPIRES_SECONDS or 900)
+            first_part: Part number of the first URL
+        """
+        try:
+            expires = timedelta(seconds=int(expires_seconds or os.getenv("S3_PRESIGN_EXPIRES_SECONDS", "900")))
+            presign_client = self._get_presign_client(network=network)
+            return [
+                presign_client.get_presigned_url(
+                    "PUT",
+                    self.bucket_name,
+                    object_name,
+                    expires=expires,
+                    extra_query_params={"partNumber": str(part_number), "uploadId": upload_id},
+                )
+                for part_number in range(first_part, first_part + parts)
+            ]
+        except S3Error as e:
+            raise Exception(f"Failed to create presigned part urls for '{object_name}': {e}")
+
+    def complete_multipart_upload(self, object_name: str, upload_id: str, parts: List[Tuple[int, str]]) -> None:
+        """
+        Assemble an uploaded object from its parts.
+
+        Args:
+            object_name: S3 object key
+            upload_id: ID from create_multipart_upload
+            parts: (part_number, etag) for every part, in order
+        """
+        try:
+            self.client._complete_multipart_upload(
+                self.bucket_name,
+                object_name,
+                upload_id,
+                [Part(part_number, etag) for part_number, etag in parts],
+            )
+        except S3Error as e:
+            raise Exception(f"Failed to complete multipart upload for '{object_name}': {e}")
+
+    def abort_multipart_upload(self, object_name: str, upload_id: str) -> None:
+        """
+        Discard a multipart upload and any parts already stored.
+
+        Args:
+            object_name: S3 object key
+            upload_id: ID from create_multipart_upload
+        """
+        try:
+            self.client._abort_multipart_upload(self.bucket_name, object_name, upload_id)
+        except S3Error as e:
+            raise Exception(f"Failed to abort multipart upload for '{object_name}': {e}")
+
     def file_exists(self, object_name: str) -> bool:
         """
         Check if file exists in MinIO
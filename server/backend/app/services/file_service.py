@@ -1,6 +1,6 @@
 # File operations - upload to MinIO, retrieve from MinIO, delete files, list files
 
-from typing import BinaryIO, List, Dict, Optional, Any
+from typing import BinaryIO, Iterator, List, Dict, Optional, Any
 from sqlalchemy.orm import Session
 import uuid
 import os
@@ -13,6 +13,9 @@ from app.models.file import File
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per database round trip when iterating file listings
+FILE_LIST_BATCH_SIZE = 100
+
 
 def generate_file_key(filename: str) -> str:
     """
@@ -229,6 +232,37 @@ def get_file_info(file_id: int, db: Session) -> Optional[Dict[str, Any]]:
     if not file_record:
         return None
 
+    return describe_file(file_record)
+
+
+def file_info_etag(file_record: File) -> str:
+    """
+    Weak ETag over the database fields reported by describe_file
+
+    Args:
+        file_record: File record
+
+    Returns:
+        str: ETag header value
+    """
+    state = repr((
+        file_record.id, file_record.filename, file_record.file_path, file_record.size,
+        file_record.mime_type, file_record.file_hash, file_record.upload_date,
+        file_record.description, file_record.user_id
+    ))
+    return f'W/"{hashlib.sha1(state.encode()).hexdigest()[:16]}"'
+
+
+def describe_file(file_record: File) -> Dict[str, Any]:
+    """
+    Build the file information dict for a record, including its MinIO metadata
+
+    Args:
+        file_record: File record
+
+    Returns:
+        Dict with file info
+    """
     # Get MinIO metadata
     minio_info = minio_client.get_file_info(file_record.file_path)
 
@@ -259,6 +293,22 @@ def list_files(db: Session, user_id: Optional[int] = None, limit: int = 100, off
     Returns:
         List of file info dicts
     """
+    return list(iter_files(db=db, user_id=user_id, limit=limit, offset=offset))
+
+
+def iter_files(db: Session, user_id: Optional[int] = None, limit: int = 100, offset: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate files with pagination, fetching rows from the database in batches
+
+    Args:
+        db: Database session
+        user_id: Optional filter by user
+        limit: Maximum number of results
+        offset: Pagination offset
+
+    Yields:
+        File info dicts, newest first
+    """
     query = db.query(File)
 
     if user_id is not None:
@@ -266,10 +316,8 @@ def list_files(db: Session, user_id: Optional[int] = None, limit: int = 100, off
 
     query = query.order_by(File.upload_date.desc()).limit(limit).offset(offset)
 
-    files = query.all()
-
-    return [
-        {
+    for file in query.yield_per(FILE_LIST_BATCH_SIZE):
+        yield {
             "id": file.id,
             "filename": file.filename,
             "size": file.size,
@@ -277,8 +325,6 @@ def list_files(db: Session, user_id: Optional[int] = None, limit: int = 100, off
             "upload_date": file.upload_date,
             "description": file.description
         }
-        for file in files
-    ]
 
 
 def get_file_by_id(file_id: int, db: Session) -> Optional[File]: